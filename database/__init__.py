@@ -3,10 +3,11 @@ Database abstraction layer for CyberSec-CLI.
 This module provides a unified interface for both SQLite and PostgreSQL databases.
 """
 
+import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # Try to import PostgreSQL client
 try:
@@ -20,6 +21,40 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def use_uvloop() -> bool:
+    """
+    Switch the asyncio event loop policy to uvloop when it is installed.
+
+    asyncpg's pool traffic is many small socket reads/writes, which uvloop
+    handles with fewer syscalls than the default loop. Call this from a
+    process entry point before the event loop is created.
+
+    Returns:
+        True if uvloop is now the event loop policy
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def _epoch_seconds(timestamp: Optional[str]) -> Optional[int]:
+    """Convert a stored ISO 8601 timestamp to Unix epoch seconds (UTC if naive)."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        logger.warning("Unparseable scan timestamp: %r", timestamp)
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
 class DatabaseType:
     """Enumeration of supported database types."""
 
@@ -168,6 +203,30 @@ class DatabaseInterface:
                 return {"id": scan_id, "output": output}
             return None
 
+    async def get_scan_with_results(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get scan information together with its results.
+
+        Args:
+            scan_id: Scan identifier
+
+        Returns:
+            Scan information dictionary with a ``results`` list, or None if
+            not found
+        """
+        if (
+            self.db_type == DatabaseType.POSTGRESQL
+            and HAS_POSTGRES
+            and self.initialized
+        ):
+            pg_client = self._pg_client or await get_postgres_client()
+            return await pg_client.get_scan_with_results(scan_id)
+        else:
+            scan = await self.get_scan(scan_id)
+            if scan is not None:
+                scan["results"] = await self.get_scan_results(scan_id)
+            return scan
+
     async def list_user_scans(
         self, user_id: str, limit: int = 50, offset: int = 0
     ) -> List[Dict[str, Any]]:
@@ -180,7 +239,9 @@ class DatabaseInterface:
             offset: Offset for pagination
 
         Returns:
-            List of scan information dictionaries
+            List of scan information dictionaries. With either backend,
+            ``created_at`` and ``completed_at`` are Unix epoch seconds
+            (``completed_at`` is None for unfinished scans).
         """
         if (
             self.db_type == DatabaseType.POSTGRESQL
@@ -193,19 +254,52 @@ class DatabaseInterface:
             # Fallback to SQLite implementation
             from web.main import list_scans
 
-            sqlite_scans = list_scans(limit)
-            # Convert to new format
-            return [
-                {
-                    "id": str(scan["id"]),
-                    "target": scan["target"],
-                    "status": "completed",  # Assume completed for SQLite scans
-                    "user_id": None,
-                    "created_at": scan["timestamp"],
-                    "completed_at": scan["timestamp"],
-                }
-                for scan in sqlite_scans
-            ]
+            # list_scans has no offset, so fetch up to the end of the page
+            sqlite_scans = list_scans(offset + limit)[offset:]
+            # Convert to new format, with epoch timestamps like PostgreSQL
+            scans = []
+            for scan in sqlite_scans:
+                timestamp = _epoch_seconds(scan["timestamp"])
+                scans.append(
+                    {
+                        "id": str(scan["id"]),
+                        "target": scan["target"],
+                        "status": "completed",  # Assume completed for SQLite scans
+                        "user_id": None,
+                        "created_at": timestamp,
+                        "completed_at": timestamp,
+                    }
+                )
+            return scans
+
+    async def list_user_scans_page(
+        self, user_id: str, limit: int = 50, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List scans for a user along with the user's total scan count.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of scans to return
+            offset: Offset for pagination
+
+        Returns:
+            Tuple of (scan information dictionaries, total scan count). The
+            SQLite fallback lists scans of all users, and its total counts
+            the same scans.
+        """
+        if (
+            self.db_type == DatabaseType.POSTGRESQL
+            and HAS_POSTGRES
+            and self.initialized
+        ):
+            pg_client = self._pg_client or await get_postgres_client()
+            return await pg_client.list_user_scans_page(user_id, limit, offset)
+        else:
+            from web.main import count_scans
+
+            scans = await self.list_user_scans(user_id, limit, offset)
+            return scans, count_scans()
 
     async def get_scan_results(self, scan_id: str) -> List[Dict[str, Any]]:
         """
@@ -229,6 +323,51 @@ class DatabaseInterface:
             # Return empty list for now
             return []
 
+    async def iter_scan_results(self, scan_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream scan results without loading them all into memory.
+
+        Args:
+            scan_id: Scan identifier
+
+        Yields:
+            Scan result dictionaries
+        """
+        if (
+            self.db_type == DatabaseType.POSTGRESQL
+            and HAS_POSTGRES
+            and self.initialized
+        ):
+            pg_client = self._pg_client or await get_postgres_client()
+            async for result in pg_client.iter_scan_results(scan_id):
+                yield result
+        else:
+            # SQLite doesn't have separate results table
+            for result in await self.get_scan_results(scan_id):
+                yield result
+
+    async def get_scan_results_summary(self, scan_id: str) -> List[Dict[str, Any]]:
+        """
+        Get scan results without the full metadata document.
+
+        Args:
+            scan_id: Scan identifier
+
+        Returns:
+            List of scan result dictionaries with ``cve`` and ``confidence``
+            in place of ``metadata``
+        """
+        if (
+            self.db_type == DatabaseType.POSTGRESQL
+            and HAS_POSTGRES
+            and self.initialized
+        ):
+            pg_client = self._pg_client or await get_postgres_client()
+            return await pg_client.get_scan_results_summary(scan_id)
+        else:
+            # SQLite doesn't have separate results table
+            return []
+
     async def delete_scan(self, scan_id: str) -> bool:
         """
         Delete a scan and its results.
@@ -18,6 +18,7 @@ from typing import Any, Dict, List
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 try:
+    from database import use_uvloop
     from database.postgres_client import PostgresClient
 
     HAS_POSTGRES = True
@@ -294,4 +295,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    use_uvloop()
     asyncio.run(main())
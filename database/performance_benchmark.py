@@ -17,6 +17,7 @@ from typing import Any, Dict, List
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 try:
+    from database import use_uvloop
     from database.postgres_client import PostgresClient
 
     HAS_POSTGRES = True
@@ -239,6 +240,8 @@ async def run_benchmark():
 
 def main():
     """Main function."""
+    if HAS_POSTGRES:
+        use_uvloop()
     try:
         asyncio.run(run_benchmark())
         return 0
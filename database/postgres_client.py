@@ -7,16 +7,114 @@ import asyncio
 import json
 import logging
 import os
+import threading
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Final, List, Optional, Tuple
 
 import asyncpg
 
 logger = logging.getLogger(__name__)
 
 _instance: Optional["PostgresClient"] = None
-_lock = asyncio.Lock()
+_init_lock = threading.Lock()
+
+# SQL statements are module-level constants so every call hands asyncpg the
+# same string object for its prepared-statement cache lookup, and all queries
+# live in one place.
+_SQL_CREATE_SCAN: Final[str] = """
+INSERT INTO scans (target, user_id, config, status)
+VALUES ($1, $2, $3, 'pending')
+RETURNING id::text
+"""
+_SQL_UPDATE_SCAN_STATUS: Final[str] = """
+UPDATE scans
+SET status = $1
+WHERE id = $2
+"""
+_SQL_UPDATE_SCAN_COMPLETED: Final[str] = """
+UPDATE scans
+SET status = $1, completed_at = $2
+WHERE id = $3
+"""
+_SQL_INSERT_SCAN_RESULTS: Final[str] = """
+INSERT INTO scan_results
+(scan_id, port, state, service, version, banner, risk_level, metadata)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+"""
+_SQL_GET_SCAN: Final[str] = """
+SELECT id, target, status, user_id, created_at, completed_at, config
+FROM scans
+WHERE id = $1
+"""
+_SQL_GET_SCAN_WITH_RESULTS: Final[str] = """
+SELECT s.id, s.target, s.status, s.user_id, s.created_at,
+       s.completed_at, s.config,
+       COALESCE(
+           json_agg(
+               json_build_object(
+                   'id', r.id,
+                   'port', r.port,
+                   'state', r.state,
+                   'service', r.service,
+                   'version', r.version,
+                   'banner', r.banner,
+                   'risk', r.risk_level,
+                   'metadata', COALESCE(r.metadata, '{}'::jsonb)
+               )
+               ORDER BY r.port
+           ) FILTER (WHERE r.id IS NOT NULL),
+           '[]'
+       ) AS results
+FROM scans s
+LEFT JOIN scan_results r ON r.scan_id = s.id
+WHERE s.id = $1
+GROUP BY s.id
+"""
+_SQL_LIST_USER_SCANS: Final[str] = """
+SELECT id, target, status, user_id,
+       EXTRACT(EPOCH FROM created_at)::bigint AS created_at,
+       EXTRACT(EPOCH FROM completed_at)::bigint AS completed_at
+FROM scans
+WHERE user_id = $1
+ORDER BY scans.created_at DESC
+LIMIT $2 OFFSET $3
+"""
+_SQL_LIST_USER_SCANS_PAGE: Final[str] = """
+SELECT id, target, status, user_id,
+       EXTRACT(EPOCH FROM created_at)::bigint AS created_at,
+       EXTRACT(EPOCH FROM completed_at)::bigint AS completed_at,
+       COUNT(*) OVER () AS total
+FROM scans
+WHERE user_id = $1
+ORDER BY scans.created_at DESC
+LIMIT $2 OFFSET $3
+"""
+_SQL_COUNT_USER_SCANS: Final[str] = "SELECT COUNT(*) FROM scans WHERE user_id = $1"
+_SQL_GET_SCAN_RESULTS: Final[str] = """
+SELECT id, port, state, service, version, banner,
+       risk_level AS risk, metadata
+FROM scan_results
+WHERE scan_id = $1
+ORDER BY port
+"""
+_SQL_GET_SCAN_RESULTS_SUMMARY: Final[str] = """
+SELECT port, state, service, version, risk_level AS risk,
+       CASE WHEN jsonb_typeof(metadata->'cve') = 'array'
+            THEN ARRAY(SELECT jsonb_array_elements_text(metadata->'cve'))
+            ELSE '{}'::text[]
+       END AS cve,
+       CASE WHEN jsonb_typeof(metadata->'confidence') = 'number'
+            THEN (metadata->>'confidence')::float
+       END AS confidence
+FROM scan_results
+WHERE scan_id = $1
+ORDER BY port
+"""
+_SQL_DELETE_SCAN: Final[str] = """
+DELETE FROM scans
+WHERE id = $1
+"""
 
 
 class PostgresClient:
@@ -26,20 +124,38 @@ class PostgresClient:
         if hasattr(self, '_initialized') and self._initialized:
             return
 
-        self.pool = None
-        self.enabled = False
+        # asyncpg pools and tasks are bound to the event loop that created
+        # them, so each loop gets its own pool and connect attempt
+        self._pools: Dict[asyncio.AbstractEventLoop, asyncpg.Pool] = {}
+        self._connect_tasks: Dict[asyncio.AbstractEventLoop, asyncio.Future] = {}
         self._initialized = True
 
+    @property
+    def pool(self) -> Optional[asyncpg.Pool]:
+        """Connection pool of the running event loop, or None."""
+        return self._pools.get(_running_loop())
+
+    @property
+    def enabled(self) -> bool:
+        """True once the running event loop has a working connection pool."""
+        return self.pool is not None
+
     async def initialize(self):
-        """Initialize the PostgreSQL connection pool."""
+        """Initialize the PostgreSQL connection pool for the running event loop."""
         database_url = os.getenv("DATABASE_URL")
         if not database_url:
             logger.warning("DATABASE_URL not set, PostgreSQL disabled")
             return False
 
+        loop = asyncio.get_running_loop()
+        old_pool = self._pools.pop(loop, None)
+        if old_pool is not None:
+            await old_pool.close()
+
+        pool = None
         try:
             # Create connection pool
-            self.pool = await asyncpg.create_pool(
+            pool = await asyncpg.create_pool(
                 database_url,
                 min_size=5,
                 max_size=20,
@@ -48,25 +164,63 @@ class PostgresClient:
             )
 
             # Test connection
-            async with self.pool.acquire() as conn:
+            async with pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
 
-            self.enabled = True
+            self._pools[loop] = pool
             logger.info("PostgreSQL connection pool initialized successfully")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize PostgreSQL connection pool: {e}")
+            logger.error("Failed to initialize PostgreSQL connection pool: %s", e)
             # Clean up pool on failure
-            if hasattr(self, "pool") and self.pool:
-                await self.pool.close()
-                self.pool = None
-            self.enabled = False
+            if pool is not None:
+                await pool.close()
             raise
 
     async def connect(self) -> bool:
-        """Alias for initialize to support singleton setup."""
-        return await self.initialize()
+        """
+        Initialize the pool once for singleton setup.
+
+        Concurrent and later callers on the same event loop await the same
+        initialization attempt instead of creating additional pools. A failed
+        attempt, whether it raised or returned False, is forgotten so the
+        next call retries. A call from another event loop starts its own
+        attempt and gets its own pool, since both are bound to their loop.
+        """
+        self._discard_closed_loops()
+        loop = asyncio.get_running_loop()
+        task = self._connect_tasks.get(loop)
+        if task is None:
+            task = self._connect_tasks[loop] = loop.create_task(self.initialize())
+        try:
+            # Shield so a cancelled caller does not cancel the shared attempt
+            connected = await asyncio.shield(task)
+        except Exception:
+            self._forget_connect_task(loop, task)
+            raise
+        if not connected:
+            self._forget_connect_task(loop, task)
+        return connected
+
+    def _forget_connect_task(
+        self, loop: asyncio.AbstractEventLoop, task: asyncio.Future
+    ) -> None:
+        """Drop task as loop's cached connect attempt, unless it was replaced."""
+        if self._connect_tasks.get(loop) is task:
+            del self._connect_tasks[loop]
+
+    def _discard_closed_loops(self) -> None:
+        """Drop the pools and attempts of event loops that have been closed."""
+        for loop in [loop for loop in self._connect_tasks if loop.is_closed()]:
+            del self._connect_tasks[loop]
+        for loop in [loop for loop in self._pools if loop.is_closed()]:
+            pool = self._pools.pop(loop)
+            try:
+                # close() needs the pool's own loop; just drop the connections
+                pool.terminate()
+            except Exception as e:
+                logger.debug("Failed to terminate pool of a closed loop: %s", e)
 
     async def create_scan(
         self,
@@ -88,24 +242,19 @@ class PostgresClient:
         if not self.enabled:
             raise Exception("PostgreSQL not enabled")
 
-        scan_id = str(uuid.uuid4())
-
         try:
             async with self.pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO scans (id, target, user_id, config, status)
-                    VALUES ($1, $2, $3, $4, $5)
-                    """,
-                    scan_id,
+                # Let Postgres assign the id (column default) and hand it back
+                # in the same round-trip.
+                scan_id = await conn.fetchval(
+                    _SQL_CREATE_SCAN,
                     target,
                     user_id,
                     json.dumps(config) if config else None,
-                    "pending",
                 )
             return scan_id
         except Exception as e:
-            logger.error(f"Failed to create scan: {e}")
+            logger.error("Failed to create scan: %s", e)
             raise
 
     async def update_scan_status(
@@ -126,27 +275,19 @@ class PostgresClient:
             async with self.pool.acquire() as conn:
                 if completed_at:
                     await conn.execute(
-                        """
-                        UPDATE scans
-                        SET status = $1, completed_at = $2
-                        WHERE id = $3
-                        """,
+                        _SQL_UPDATE_SCAN_COMPLETED,
                         status,
                         completed_at,
                         scan_id,
                     )
                 else:
                     await conn.execute(
-                        """
-                        UPDATE scans
-                        SET status = $1
-                        WHERE id = $2
-                        """,
+                        _SQL_UPDATE_SCAN_STATUS,
                         status,
                         scan_id,
                     )
         except Exception as e:
-            logger.error(f"Failed to update scan status: {e}")
+            logger.error("Failed to update scan status: %s", e)
             raise
 
     async def save_scan_results(self, scan_id: str, results: List[Dict[str, Any]]):
@@ -167,9 +308,9 @@ class PostgresClient:
             # Prepare data for bulk insert
             records = []
             for result in results:
+                metadata = result.get("metadata")
                 records.append(
                     (
-                        str(uuid.uuid4()),  # id
                         scan_id,  # scan_id
                         result.get("port"),  # port
                         result.get("state"),  # state
@@ -177,21 +318,18 @@ class PostgresClient:
                         result.get("version"),  # version
                         result.get("banner"),  # banner
                         result.get("risk"),  # risk_level
-                        json.dumps(result.get("metadata", {})),  # metadata
+                        # Empty metadata is stored as NULL; readers map it back to {}
+                        json.dumps(metadata) if metadata else None,  # metadata
                     )
                 )
 
             async with self.pool.acquire() as conn:
                 await conn.executemany(
-                    """
-                    INSERT INTO scan_results
-                    (id, scan_id, port, state, service, version, banner, risk_level, metadata)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                    """,
+                    _SQL_INSERT_SCAN_RESULTS,
                     records,
                 )
         except Exception as e:
-            logger.error(f"Failed to save scan results: {e}")
+            logger.error("Failed to save scan results: %s", e)
             raise
 
     async def get_scan(self, scan_id: str) -> Optional[Dict[str, Any]]:
@@ -207,36 +345,49 @@ class PostgresClient:
         if not self.enabled:
             raise Exception("PostgreSQL not enabled")
 
-        try:
-            async with self.pool.acquire() as conn:
-                row = await conn.fetchrow(
-                    """
-                    SELECT id, target, status, user_id, created_at, completed_at, config
-                    FROM scans
-                    WHERE id = $1
-                    """,
-                    scan_id,
-                )
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                _SQL_GET_SCAN,
+                scan_id,
+            )
 
-                if not row:
-                    return None
-
-                return {
-                    "id": row["id"],
-                    "target": row["target"],
-                    "status": row["status"],
-                    "user_id": row["user_id"],
-                    "created_at": (
-                        row["created_at"].isoformat() if row["created_at"] else None
-                    ),
-                    "completed_at": (
-                        row["completed_at"].isoformat() if row["completed_at"] else None
-                    ),
-                    "config": json.loads(row["config"]) if row["config"] else None,
-                }
-        except Exception as e:
-            logger.error(f"Failed to get scan: {e}")
-            raise
+            if not row:
+                return None
+
+            return _scan_from_row(row)
+
+    async def get_scan_with_results(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get scan information together with its results in one query.
+
+        Equivalent to get_scan() followed by get_scan_results(), but the
+        results are aggregated server-side so only one round-trip is made.
+
+        Args:
+            scan_id: Scan identifier
+
+        Returns:
+            Scan information dictionary with a ``results`` list, or None if
+            not found
+        """
+        if not self.enabled:
+            raise Exception("PostgreSQL not enabled")
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                _SQL_GET_SCAN_WITH_RESULTS,
+                scan_id,
+            )
+
+            if not row:
+                return None
+
+            scan = _scan_from_row(row)
+            scan["results"] = results = json.loads(scan["results"])
+            # JSON carries the ids as text; match get_scan_results()
+            for result in results:
+                result["id"] = uuid.UUID(result["id"])
+            return scan
 
     async def list_user_scans(
         self, user_id: str, limit: int = 50, offset: int = 0
@@ -250,46 +401,68 @@ class PostgresClient:
             offset: Offset for pagination
 
         Returns:
-            List of scan information dictionaries
+            List of scan information dictionaries. ``created_at`` and
+            ``completed_at`` are Unix epoch seconds (``completed_at`` is None
+            for unfinished scans).
         """
         if not self.enabled:
             raise Exception("PostgreSQL not enabled")
 
-        try:
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch(
-                    """
-                    SELECT id, target, status, user_id, created_at, completed_at
-                    FROM scans
-                    WHERE user_id = $1
-                    ORDER BY created_at DESC
-                    LIMIT $2 OFFSET $3
-                    """,
-                    user_id,
-                    limit,
-                    offset,
-                )
+        async with self.pool.acquire() as conn:
+            # Timestamps are converted to epoch seconds server-side so no
+            # datetime objects are built or formatted per row.
+            rows = await conn.fetch(
+                _SQL_LIST_USER_SCANS,
+                user_id,
+                limit,
+                offset,
+            )
 
-                return [
-                    {
-                        "id": row["id"],
-                        "target": row["target"],
-                        "status": row["status"],
-                        "user_id": row["user_id"],
-                        "created_at": (
-                            row["created_at"].isoformat() if row["created_at"] else None
-                        ),
-                        "completed_at": (
-                            row["completed_at"].isoformat()
-                            if row["completed_at"]
-                            else None
-                        ),
-                    }
-                    for row in rows
-                ]
-        except Exception as e:
-            logger.error(f"Failed to list user scans: {e}")
-            raise
+            return [dict(row) for row in rows]
+
+    async def list_user_scans_page(
+        self, user_id: str, limit: int = 50, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List scans for a user along with the user's total scan count.
+
+        The total is computed with a window function in the same query as
+        the page, so paginated listings need a single round-trip.
+
+        Args:
+            user_id: User identifier
+            limit: Maximum number of scans to return
+            offset: Offset for pagination
+
+        Returns:
+            Tuple of (scans, total) where scans has the same shape as
+            list_user_scans()
+        """
+        if not self.enabled:
+            raise Exception("PostgreSQL not enabled")
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SQL_LIST_USER_SCANS_PAGE,
+                user_id,
+                limit,
+                offset,
+            )
+
+            if rows:
+                total = rows[0]["total"]
+            elif offset:
+                # A page past the end has no rows to carry the window count
+                total = await conn.fetchval(_SQL_COUNT_USER_SCANS, user_id)
+            else:
+                total = 0
+
+        scans = []
+        for row in rows:
+            scan = dict(row)
+            del scan["total"]
+            scans.append(scan)
+        return scans, total
 
     async def get_scan_results(self, scan_id: str) -> List[Dict[str, Any]]:
         """
@@ -304,36 +477,70 @@ class PostgresClient:
         if not self.enabled:
             raise Exception("PostgreSQL not enabled")
 
-        try:
-            async with self.pool.acquire() as conn:
-                rows = await conn.fetch(
-                    """
-                    SELECT id, port, state, service, version, banner, risk_level, metadata
-                    FROM scan_results
-                    WHERE scan_id = $1
-                    ORDER BY port
-                    """,
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SQL_GET_SCAN_RESULTS,
+                scan_id,
+            )
+
+            return [_result_from_row(row) for row in rows]
+
+    async def iter_scan_results(
+        self, scan_id: str, prefetch: int = 1024
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream scan results through a server-side cursor.
+
+        Unlike get_scan_results(), rows are fetched ``prefetch`` at a time so
+        scans with very many results are never fully materialised in memory.
+        The pooled connection is held until the iterator is exhausted or
+        closed.
+
+        Args:
+            scan_id: Scan identifier
+            prefetch: Number of rows to fetch per round-trip
+
+        Yields:
+            Scan result dictionaries, ordered by port
+        """
+        if not self.enabled:
+            raise Exception("PostgreSQL not enabled")
+
+        async with self.pool.acquire() as conn:
+            # Cursors only exist inside a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(
+                    _SQL_GET_SCAN_RESULTS,
                     scan_id,
-                )
+                    prefetch=prefetch,
+                ):
+                    yield _result_from_row(row)
 
-                return [
-                    {
-                        "id": row["id"],
-                        "port": row["port"],
-                        "state": row["state"],
-                        "service": row["service"],
-                        "version": row["version"],
-                        "banner": row["banner"],
-                        "risk": row["risk_level"],
-                        "metadata": (
-                            json.loads(row["metadata"]) if row["metadata"] else {}
-                        ),
-                    }
-                    for row in rows
-                ]
-        except Exception as e:
-            logger.error(f"Failed to get scan results: {e}")
-            raise
+    async def get_scan_results_summary(self, scan_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a compact view of scan results.
+
+        Only the ``cve`` and ``confidence`` metadata fields are returned, and
+        they are extracted server-side so the metadata document is neither
+        transferred nor decoded. Use get_scan_results() for the full record.
+
+        Args:
+            scan_id: Scan identifier
+
+        Returns:
+            List of dictionaries with port, state, service, version, risk,
+            cve (list of strings) and confidence (float or None)
+        """
+        if not self.enabled:
+            raise Exception("PostgreSQL not enabled")
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                _SQL_GET_SCAN_RESULTS_SUMMARY,
+                scan_id,
+            )
+
+            return [dict(row) for row in rows]
 
     async def delete_scan(self, scan_id: str) -> bool:
         """
@@ -351,10 +558,7 @@ class PostgresClient:
         try:
             async with self.pool.acquire() as conn:
                 result = await conn.execute(
-                    """
-                    DELETE FROM scans
-                    WHERE id = $1
-                    """,
+                    _SQL_DELETE_SCAN,
                     scan_id,
                 )
                 # Due to CASCADE delete, scan results are automatically deleted
@@ -362,26 +566,69 @@ class PostgresClient:
                 try:
                     deleted_count = int(str(result).split()[-1])
                 except (ValueError, IndexError, AttributeError):
-                    logger.warning(f"Unexpected delete result tag: {result!r}")
+                    logger.warning("Unexpected delete result tag: %r", result)
                     return False
                 return deleted_count > 0
         except Exception as e:
-            logger.error(f"Failed to delete scan: {e}")
+            logger.error("Failed to delete scan: %s", e)
             raise
 
     async def close(self):
-        """Close the connection pool."""
-        if self.pool:
-            await self.pool.close()
+        """Close the running event loop's connection pool."""
+        loop = asyncio.get_running_loop()
+        self._connect_tasks.pop(loop, None)
+        pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool.close()
             logger.info("PostgreSQL connection pool closed")
 
 
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The running event loop, or None outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _scan_from_row(row: asyncpg.Record) -> Dict[str, Any]:
+    """Convert a scans row into the dictionary shape returned by get_scan."""
+    scan = dict(row)
+    if scan["created_at"]:
+        scan["created_at"] = scan["created_at"].isoformat()
+    if scan["completed_at"]:
+        scan["completed_at"] = scan["completed_at"].isoformat()
+    scan["config"] = json.loads(scan["config"]) if scan["config"] else None
+    return scan
+
+
+def _result_from_row(row: asyncpg.Record) -> Dict[str, Any]:
+    """Convert a scan_results row into the get_scan_results() dictionary shape."""
+    # Columns are aliased to the result keys so each Record can be copied
+    # with dict() instead of indexing every column.
+    result = dict(row)
+    metadata = result["metadata"]
+    result["metadata"] = json.loads(metadata) if metadata else {}
+    return result
+
+
 async def get_postgres_client() -> "PostgresClient":
-    """Get a singleton PostgresClient instance with async-safe initialization."""
+    """
+    Get a singleton PostgresClient instance.
+
+    Creation is guarded by a threading.Lock rather than an asyncio.Lock, so
+    no primitive is tied to whichever event loop first used this module, and
+    the lock is skipped entirely once the instance exists. The client only
+    connects when DATABASE_URL is set and the running event loop has no
+    pool yet; otherwise it is returned as is.
+    """
     global _instance
-    if _instance is None:
-        async with _lock:
+    inst = _instance
+    if inst is None:
+        with _init_lock:
             if _instance is None:
                 _instance = PostgresClient()
-                await _instance.connect()
-    return _instance
+            inst = _instance
+    if not inst.enabled and os.getenv("DATABASE_URL"):
+        await inst.connect()
+    return inst
@@ -99,7 +99,7 @@ async def demonstrate_postgresql_usage():
 
         # Retrieve scan results
         print("7. Retrieving scan results...")
-        results = await db_interface.get_scan_results(scan_id)
+        results = await db_interface.get_scan_results_summary(scan_id)
         print(f"   Found {len(results)} scan results:")
         for result in results:
             print(
@@ -5,6 +5,20 @@ Example script demonstrating how to use the SSE streaming scan endpoint.
 import json
 import time
 
+# Events the streaming endpoint emits for a small scan
+_EXAMPLE_EVENTS = (
+    {"type": "info", "message": "Starting scan on example.com with 100 ports"},
+    {"type": "group_start", "priority": "critical", "count": 11},
+    {"type": "open_port", "port": 22, "service": "ssh"},
+    {"type": "open_port", "port": 80, "service": "http"},
+    {"type": "group_complete", "priority": "critical", "open_count": 2},
+    {"type": "group_start", "priority": "high", "count": 11},
+    {"type": "open_port", "port": 443, "service": "https"},
+    {"type": "group_complete", "priority": "high", "open_count": 1},
+    {"type": "scan_complete", "message": "Scan completed"},
+)
+_EXAMPLE_EVENT_STRS = tuple(json.dumps(event) for event in _EXAMPLE_EVENTS)
+
 
 def demonstrate_sse_streaming():
     """
@@ -18,21 +32,9 @@ def demonstrate_sse_streaming():
     # curl "http://localhost:8000/api/stream/scan/example.com?ports=1-100"
 
     # For demonstration purposes, let's show what the events would look like:
-    example_events = [
-        {"type": "info", "message": "Starting scan on example.com with 100 ports"},
-        {"type": "group_start", "priority": "critical", "count": 11},
-        {"type": "open_port", "port": 22, "service": "ssh"},
-        {"type": "open_port", "port": 80, "service": "http"},
-        {"type": "group_complete", "priority": "critical", "open_count": 2},
-        {"type": "group_start", "priority": "high", "count": 11},
-        {"type": "open_port", "port": 443, "service": "https"},
-        {"type": "group_complete", "priority": "high", "open_count": 1},
-        {"type": "scan_complete", "message": "Scan completed"},
-    ]
-
     print("Example events that would be streamed:")
-    for event in example_events:
-        print(f"Event: {json.dumps(event)}")
+    for event in _EXAMPLE_EVENT_STRS:
+        print(f"Event: {event}")
         time.sleep(0.5)  # Simulate delay between events
 
     print("\nIn a JavaScript frontend, you would use:")
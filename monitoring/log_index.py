@@ -0,0 +1,190 @@
+"""Persistent index of JSON log line locations by scan ID"""
+
+import gzip
+import io
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # optional
+    _loads = json.loads
+
+
+# Block size used when reading plain and gzipped log files
+_READ_BUFFER_SIZE = 256 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    indexed_offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    scan_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_scan_id ON entries(scan_id);
+CREATE INDEX IF NOT EXISTS idx_entries_path ON entries(path);
+"""
+
+
+def open_log(path: str):
+    """
+    Open a plain or gzipped log file for binary reading, in large blocks so
+    line iteration stays in C.
+    """
+    if path.endswith(".gz"):
+        return io.BufferedReader(gzip.open(path, "rb"), buffer_size=_READ_BUFFER_SIZE)
+    return open(path, "rb", buffering=_READ_BUFFER_SIZE)
+
+
+class LogIndex:
+    """
+    SQLite index mapping ``context.scan_id`` to (file, offset, length) of the
+    log lines that mention it.
+
+    Plain log files are indexed incrementally: only bytes appended since the
+    last update are read. A file that shrinks or is replaced (new inode), as
+    happens on rotation, is re-indexed from the start. Offsets into gzipped
+    files refer to the decompressed stream.
+    """
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the index database."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def update(self, log_files: Iterable) -> None:
+        """Bring the index up to date with ``log_files`` and forget other files."""
+        paths = [str(log_file) for log_file in log_files]
+
+        with self.conn:
+            # Take the write lock before reading what is indexed, so a
+            # concurrent update sees this one's rows instead of re-adding them
+            self.conn.execute("BEGIN IMMEDIATE")
+            known = {
+                row[0]: row[1:]
+                for row in self.conn.execute(
+                    "SELECT path, inode, size, indexed_offset FROM files"
+                )
+            }
+
+            for path in set(known) - set(paths):
+                self._forget(path)
+
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+
+                start = self._resume_offset(path, st, known.get(path))
+                if start is None:
+                    continue
+                if start == 0 and path in known:
+                    self._forget(path)
+
+                indexed_offset = self._index_file(path, start)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (path, inode, size, indexed_offset)"
+                    " VALUES (?, ?, ?, ?)",
+                    (path, st.st_ino, st.st_size, indexed_offset),
+                )
+
+    def find(self, scan_id: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Return ``{path: [(offset, length), ...]}`` for lines mentioning scan_id."""
+        locations: Dict[str, List[Tuple[int, int]]] = {}
+        for path, offset, length in self.conn.execute(
+            "SELECT path, offset, length FROM entries WHERE scan_id = ?"
+            " ORDER BY path, offset",
+            (scan_id,),
+        ):
+            locations.setdefault(path, []).append((offset, length))
+        return locations
+
+    @staticmethod
+    def read_entries(path: str, spans: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Read and parse the log lines at ``spans`` (sorted by offset) of one file."""
+        entries = []
+        with open_log(path) as f:
+            for offset, length in spans:
+                f.seek(offset)
+                try:
+                    entry = _loads(f.read(length))
+                except ValueError:
+                    continue
+                # The file may have been rotated since the index was updated
+                if isinstance(entry, dict):
+                    entries.append(entry)
+        return entries
+
+    def _forget(self, path: str) -> None:
+        self.conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    @staticmethod
+    def _resume_offset(path: str, st: os.stat_result, known) -> Optional[int]:
+        """Offset to continue indexing from, or None if the file is up to date."""
+        if known is None:
+            return 0
+        inode, size, indexed_offset = known
+        if inode != st.st_ino:
+            return 0
+        if path.endswith(".gz"):
+            # Rotated archives are never appended to
+            return None if size == st.st_size else 0
+        if st.st_size == indexed_offset:
+            return None
+        if st.st_size > indexed_offset:
+            return indexed_offset
+        # Truncated in place
+        return 0
+
+    def _index_file(self, path: str, start: int) -> int:
+        """Index lines from ``start``; return the offset after the last full line."""
+        rows = []
+        offset = start
+        partial_tail_ok = path.endswith(".gz")
+
+        with open_log(path) as f:
+            if start:
+                f.seek(start)
+            for line in f:
+                length = len(line)
+                if not line.endswith(b"\n") and not partial_tail_ok:
+                    # Line still being written; pick it up on the next update
+                    break
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict):
+                    context = entry.get("context")
+                    scan_id = context.get("scan_id") if isinstance(context, dict) else None
+                    if isinstance(scan_id, str):
+                        rows.append((scan_id, path, offset, length))
+                offset += length
+
+        self.conn.executemany(
+            "INSERT INTO entries (scan_id, path, offset, length) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        return offset
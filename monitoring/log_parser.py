@@ -1,13 +1,33 @@
 """Utility for parsing and querying JSON logs"""
 
-import gzip
 import json
 import os
 import re
-from functools import lru_cache
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # optional
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+try:
+    from monitoring.log_index import LogIndex, open_log
+except ImportError:  # run as a script from monitoring/
+    from log_index import LogIndex, open_log
 
 
 AUDIT_LOG_PATH = os.environ.get(
@@ -15,47 +35,403 @@ AUDIT_LOG_PATH = os.environ.get(
     "/var/log/audit/audit.log",
 )
 
+# Counter slots used by generate_report; levels outside this map count
+# towards the total only
+_LEVEL_INDEX = {"ERROR": 1, "WARNING": 2, "INFO": 3, "DEBUG": 4}
+_REPORT_COUNTERS = ("total", "errors", "warnings", "info", "debug")
+
+
+def _json_needle(value: str) -> Optional[bytes]:
+    """
+    Return how a JSON string value appears in a raw log line, for use as a
+    cheap substring pre-check, or None if its encoding is ambiguous.
+    """
+    encoded = json.dumps(value)
+    if encoded[1:-1] != value:
+        # Escaped characters may be serialized differently by other writers
+        return None
+    return encoded.encode("ascii")
+
+
+if sys.version_info >= (3, 11):
+
+    def _ts_to_epoch(value: str) -> float:
+        """Convert an ISO-8601 log timestamp to POSIX seconds."""
+        # fromisoformat() accepts a trailing "Z" natively from 3.11
+        return datetime.fromisoformat(value).timestamp()
+
+else:
+
+    def _ts_to_epoch(value: str) -> float:
+        """Convert an ISO-8601 log timestamp to POSIX seconds."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+@lru_cache(maxsize=64)
+def _canonical_level(level: str) -> str:
+    """
+    Upper-cased, interned form of a log level. Logs use only a handful of
+    distinct spellings, so each is re-cased once rather than once per line.
+    """
+    return sys.intern(level.upper())
+
+
+def _modified_before(path, when: datetime) -> bool:
+    """True if the file was last written before ``when``."""
+    try:
+        return os.path.getmtime(path) < when.timestamp()
+    except OSError:
+        return False
+
+
+# How long a directory listing from _find_log_files is reused, so rotated
+# files are picked up without rescanning on every query
+_LOG_FILES_TTL = 60
+
+
+def _scan_log_dir(root: str, live: List[str], rotated: List[str]) -> None:
+    """Collect live and rotated log file paths under ``root``, recursively."""
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                _scan_log_dir(entry.path, live, rotated)
+            elif name.endswith(".log"):
+                live.append(entry.path)
+            elif ".log." in name:
+                rotated.append(entry.path)
+
+
 @lru_cache(maxsize=1)
-def _find_log_files(log_dir: str) -> tuple:
-    return tuple(Path(log_dir).rglob("*.log"))
+def _find_log_files(log_dir: str, ttl_bucket: int = 0) -> Tuple[str, ...]:
+    """
+    Find live (*.log) and rotated (*.log.1, *.log.1.gz) log files, as path
+    strings with live files first.
+
+    ``ttl_bucket`` only takes part in the cache key; callers pass the current
+    time window so the listing is refreshed periodically.
+    """
+    live: List[str] = []
+    rotated: List[str] = []
+    _scan_log_dir(log_dir, live, rotated)
+    return tuple(live + rotated)
+
+
+def _iter_log_lines(file_path, contains: Optional[bytes] = None) -> Iterator[bytes]:
+    """Yield the stripped, non-blank raw lines of one log file."""
+    path = os.fspath(file_path)
+
+    # Read raw bytes; the JSON parser accepts them without a decode step.
+    with open_log(path) as f:
+        for line in f:
+            line = line.strip()
+            if contains is not None and contains not in line:
+                continue
+            if line:
+                yield line
+
+
+def _iter_log_entries(
+    file_path, contains: Optional[bytes] = None
+) -> Generator[Dict[str, Any], None, None]:
+    """Yield the JSON entries of one log file (see LogParser.parse_log_file)."""
+    for line in _iter_log_lines(file_path, contains=contains):
+        try:
+            yield _loads(line)
+        except ValueError:
+            # Skip invalid JSON (or non-UTF-8) lines
+            continue
+
+
+def _iter_log_batches(
+    file_path, contains: Optional[bytes] = None, batch: int = 1024
+) -> Generator[List[Dict[str, Any]], None, None]:
+    """Yield the JSON entries of one log file in lists of up to ``batch``."""
+    buf = []
+    for line in _iter_log_lines(file_path, contains=contains):
+        try:
+            buf.append(_loads(line))
+        except ValueError:
+            continue
+        if len(buf) == batch:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+# Leading fields in the order JsonFormatter writes them, plus the message if
+# it directly follows. Values containing escapes are not matched, so such
+# lines take the full JSON parse (an escaped message only leaves the optional
+# group unmatched).
+_HEAD_RE = re.compile(
+    rb'\{\s*"timestamp":\s*"([^"\\]*)",\s*"level":\s*"([^"\\]*)",'
+    rb'\s*"component":\s*"([^"\\]*)"(?:,\s*"message":\s*"([^"\\]*)")?'
+)
+
+# A log record reduced to (timestamp, level, component, message, scan_id)
+LogRecord = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def _head_fields(line: bytes) -> Optional[Tuple[str, str, str, Optional[str]]]:
+    """
+    Return (timestamp, level, component, message) read straight from a raw
+    log line, or None if the line does not have the JsonFormatter layout.
+    ``message`` is None when it could not be read without a full parse.
+    """
+    if not line.endswith(b"}"):
+        return None
+    match = _HEAD_RE.match(line)
+    if match is None:
+        return None
+    try:
+        return tuple(
+            value.decode("utf-8") if value is not None else None
+            for value in match.groups()
+        )
+    except UnicodeDecodeError:
+        return None
+
+
+def _iter_log_records(file_path) -> Generator[LogRecord, None, None]:
+    """Yield one LogRecord per log line (see LogParser.parse_log_file_fast)."""
+    for line in _iter_log_lines(file_path):
+        fields = _head_fields(line)
+        if fields is not None and fields[3] is not None and b'"scan_id"' not in line:
+            yield fields + (None,)
+            continue
+
+        try:
+            entry = _loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        context = entry.get("context")
+        yield (
+            entry.get("timestamp"),
+            entry.get("level"),
+            entry.get("component"),
+            entry.get("message"),
+            context.get("scan_id") if isinstance(context, dict) else None,
+        )
+
+
+# The per-file workers below are module-level functions so they can be sent to
+# worker processes by LogParser._map_log_files.
+
+
+def _search_file(
+    log_file,
+    *,
+    component: Optional[str],
+    level: Optional[str],
+    start_epoch: Optional[float],
+    end_epoch: Optional[float],
+    message_re: Optional["re.Pattern[str]"],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` entries of one log file matching the search_logs filters."""
+    results = []
+    needle = _json_needle(component) if component else None
+
+    for line in _iter_log_lines(log_file, contains=needle):
+        # Filter on the leading fields first and only parse lines that pass
+        entry = None
+        fields = _head_fields(line)
+        if fields is None:
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            fields = (
+                entry.get("timestamp"),
+                entry.get("level", ""),
+                entry.get("component"),
+                entry.get("message", ""),
+            )
+        timestamp_value, entry_level, entry_component, entry_message = fields
+
+        # Apply filters - use .get() with safe defaults
+        if component and entry_component != component:
+            continue
+        if level and _canonical_level(entry_level) != level:
+            continue
+        if start_epoch is not None or end_epoch is not None:
+            if not timestamp_value:
+                continue
+            try:
+                timestamp = _ts_to_epoch(timestamp_value)
+            except (TypeError, ValueError):
+                # Skip entries with invalid timestamp format
+                continue
+            if start_epoch is not None and timestamp < start_epoch:
+                continue
+            if end_epoch is not None and timestamp > end_epoch:
+                continue
+
+        if message_re:
+            if entry_message is None:
+                try:
+                    entry = _loads(line)
+                except ValueError:
+                    continue
+                entry_message = entry.get("message", "")
+            if not message_re.search(entry_message):
+                continue
+
+        if entry is None:
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+
+        results.append(entry)
+
+        if len(results) >= limit:
+            break
+
+    return results
+
+
+def _count_file(
+    log_file,
+    *,
+    start_epoch: float,
+    end_epoch: float,
+    wanted: Optional[set],
+) -> Tuple[List[int], Dict[str, List[int]]]:
+    """Return generate_report counters (totals, per-component) for one log file."""
+    # Flat counters indexed by _LEVEL_INDEX: [total, errors, warnings,
+    # info, debug, other], one list per component plus the overall totals
+    totals = [0] * 6
+    component_counts: Dict[str, List[int]] = {}
+
+    for line in _iter_log_lines(log_file):
+        # Only the leading fields are needed; parse the line if they cannot
+        # be read directly
+        fields = _head_fields(line)
+        if fields is None:
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            fields = (
+                entry.get("timestamp"),
+                entry.get("level", "UNKNOWN"),
+                entry.get("component", "unknown"),
+                None,
+            )
+        timestamp_value, level, component, _ = fields
+
+        try:
+            timestamp = _ts_to_epoch(timestamp_value)
+        except (TypeError, ValueError):
+            continue
+        if timestamp < start_epoch or timestamp > end_epoch:
+            continue
+
+        # Filter by components if specified
+        if wanted and component not in wanted:
+            continue
+
+        idx = _LEVEL_INDEX.get(_canonical_level(level), 5)
+        counts = component_counts.get(component)
+        if counts is None:
+            counts = component_counts[component] = [0] * 6
+        counts[0] += 1
+        counts[idx] += 1
+        totals[0] += 1
+        totals[idx] += 1
+
+    return totals, component_counts
 
 
 class LogParser:
     """Utility class for parsing and querying JSON logs"""
 
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        max_workers: Optional[int] = None,
+        index_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            log_dir: Directory containing log files
+            max_workers: Worker processes used to scan several log files at
+                once (defaults to the CPU count; 1 scans serially)
+            index_path: SQLite scan_id index used by get_scan_logs
+                (defaults to ``<log_dir>/log_index.sqlite``)
+        """
         self.log_dir = Path(log_dir)
+        self.max_workers = max_workers
+        self.index_path = index_path or str(self.log_dir / "log_index.sqlite")
 
     def _get_log_files(self):
         """Get log files with caching for performance."""
-        return _find_log_files(str(self.log_dir))
-
-
-    def parse_log_file(self, file_path: str) -> Generator[Dict[str, Any], None, None]:
-        """Parse a log file and yield log entries as dictionaries"""
-        path = Path(file_path)
-
-        # Handle compressed files
-        if path.suffix == ".gz":
-            with gzip.open(path, "rt", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            yield json.loads(line)
-                        except json.JSONDecodeError:
-                            # Skip invalid JSON lines
-                            continue
-        else:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            yield json.loads(line)
-                        except json.JSONDecodeError:
-                            # Skip invalid JSON lines
-                            continue
+        return _find_log_files(
+            str(self.log_dir), int(time.monotonic() // _LOG_FILES_TTL)
+        )
+
+    def _map_log_files(self, func: Callable, log_files) -> Iterator[Any]:
+        """
+        Yield ``func(log_file)`` for each file, in file order.
+
+        Files are handed to a process pool when there is more than one file
+        and more than one worker; otherwise they are processed lazily in this
+        process. Work still pending when the caller stops iterating is
+        cancelled.
+        """
+        log_files = list(log_files)
+        workers = min(self.max_workers or os.cpu_count() or 1, len(log_files))
+        if workers < 2:
+            for log_file in log_files:
+                yield func(log_file)
+            return
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield from executor.map(func, log_files)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def parse_log_file(
+        self, file_path: str, contains: Optional[bytes] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Parse a log file and yield log entries as dictionaries.
+
+        If ``contains`` is given, lines that do not include those bytes are
+        skipped before JSON parsing. Callers must still apply their exact
+        filter to the entries that are yielded.
+        """
+        return _iter_log_entries(file_path, contains=contains)
+
+    def parse_log_file_fast(self, file_path: str) -> Generator[LogRecord, None, None]:
+        """
+        Parse a log file and yield (timestamp, level, component, message,
+        scan_id) tuples.
+
+        Lines in the JsonFormatter layout are read without building a dict;
+        other lines, and lines that carry a scan_id, are parsed in full.
+        """
+        return _iter_log_records(file_path)
+
+    def parse_log_file_batched(
+        self, file_path: str, batch: int = 1024, contains: Optional[bytes] = None
+    ) -> Generator[List[Dict[str, Any]], None, None]:
+        """
+        Parse a log file and yield lists of up to ``batch`` log entries.
+
+        Lets callers filter a whole batch at once (comprehension, DataFrame
+        construction) instead of paying generator overhead per entry.
+        """
+        return _iter_log_batches(file_path, contains=contains, batch=batch)
 
     def search_logs(
         self,
@@ -68,41 +444,31 @@ class LogParser:
     ) -> List[Dict[str, Any]]:
         """Search logs with various filters"""
         results = []
+        search = partial(
+            _search_file,
+            component=component,
+            level=_canonical_level(level) if level else None,
+            # Compare timestamps as POSIX seconds so naive and aware datetimes mix
+            start_epoch=start_time.timestamp() if start_time else None,
+            end_epoch=end_time.timestamp() if end_time else None,
+            message_re=(
+                re.compile(message_pattern, re.IGNORECASE) if message_pattern else None
+            ),
+            limit=limit,
+        )
 
-        # Find all log files using cached method
-        log_files = self._get_log_files()
-
-        for log_file in log_files:
-            for entry in self.parse_log_file(log_file):
-                # Apply filters - use .get() with safe defaults
-                if component and entry.get("component") != component:
-                    continue
-                if level and entry.get("level", "").upper() != level.upper():
-                    continue
-                if start_time or end_time:
-                    try:
-                        timestamp_value = entry.get("timestamp", "")
-                        if not timestamp_value:
-                            continue
-                        timestamp = datetime.fromisoformat(
-                            timestamp_value.replace("Z", "+00:00")
-                        )
-                        if start_time and timestamp < start_time:
-                            continue
-                        if end_time and timestamp > end_time:
-                            continue
-                    except ValueError:
-                        # Skip entries with invalid timestamp format
-                        continue
-                if message_pattern and not re.search(
-                    message_pattern, entry.get("message", ""), re.IGNORECASE
-                ):
-                    continue
-
-                results.append(entry)
+        # Find all log files using cached method; entries are never newer
+        # than their file's last write
+        log_files = [
+            log_file
+            for log_file in self._get_log_files()
+            if not (start_time and _modified_before(log_file, start_time))
+        ]
 
-                if len(results) >= limit:
-                    return results
+        for matches in self._map_log_files(search, log_files):
+            results.extend(matches)
+            if len(results) >= limit:
+                return results[:limit]
 
         return results
 
@@ -142,45 +508,70 @@ class LogParser:
         results = []
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=hours)
+        start_epoch = start_time.timestamp()
+        end_epoch = end_time.timestamp()
 
-        for entry in self.parse_log_file(audit_log_path):
-            # Check if it's within time range
+        def in_window(entry: Dict[str, Any]) -> bool:
+            timestamp_value = entry.get("timestamp")
+            if not timestamp_value:
+                return False
             try:
-                timestamp_value = entry.get("timestamp", "")
-                if not timestamp_value:
-                    continue
-                timestamp = datetime.fromisoformat(
-                    timestamp_value.replace("Z", "+00:00")
-                )
-                if start_time and timestamp < start_time:
-                    continue
-                if end_time and timestamp > end_time:
-                    continue
-            except ValueError:
-                continue
-
-            # Check if event type matches
-            if event_type and entry.get("context", {}).get("event_type") != event_type:
-                continue
-
-            results.append(entry)
+                timestamp = _ts_to_epoch(timestamp_value)
+            except (TypeError, ValueError):
+                return False
+            return start_epoch <= timestamp <= end_epoch
+
+        for batch in self.parse_log_file_batched(audit_log_path):
+            # Check if event type matches, then if it's within time range
+            if event_type:
+                batch = [
+                    entry
+                    for entry in batch
+                    if entry.get("context", {}).get("event_type") == event_type
+                ]
+            results.extend(filter(in_window, batch))
 
         return results
 
     def get_scan_logs(self, scan_id: str) -> List[Dict[str, Any]]:
-        """Get logs for a specific scan ID"""
-        results = []
+        """
+        Get logs for a specific scan ID.
 
-        # Find all log files
-        log_files = list(self.log_dir.glob("*.log")) + list(
-            self.log_dir.glob("*.log.*")
-        )
+        Lines are located through the persistent scan_id index, which is
+        brought up to date first; only the matching records are read. If the
+        index cannot be used the log files are scanned instead.
+        """
+        # Find all log files using cached method
+        log_files = self._get_log_files()
+
+        try:
+            with LogIndex(self.index_path) as index:
+                index.update(log_files)
+                locations = index.find(scan_id)
+
+            results = []
+            for log_file in log_files:
+                spans = locations.get(str(log_file))
+                if spans:
+                    results.extend(
+                        entry
+                        for entry in LogIndex.read_entries(str(log_file), spans)
+                        if entry.get("context", {}).get("scan_id") == scan_id
+                    )
+            return results
+        except (sqlite3.Error, OSError):
+            pass
+
+        results = []
+        needle = _json_needle(scan_id)
 
         for log_file in log_files:
-            for entry in self.parse_log_file(log_file):
-                context = entry.get("context", {})
-                if context.get("scan_id") == scan_id:
-                    results.append(entry)
+            for batch in self.parse_log_file_batched(log_file, contains=needle):
+                results.extend(
+                    entry
+                    for entry in batch
+                    if entry.get("context", {}).get("scan_id") == scan_id
+                )
 
         return results
 
@@ -191,66 +582,51 @@ class LogParser:
         components: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Generate a log report for a time period"""
-        report = {
-            "period_start": start_time.isoformat(),
-            "period_end": end_time.isoformat(),
-            "components": {},
-            "total_entries": 0,
-            "errors": 0,
-            "warnings": 0,
-            "info": 0,
-            "debug": 0,
-        }
-
-        # Find all log files
-        log_files = list(self.log_dir.glob("*.log")) + list(
-            self.log_dir.glob("*.log.*")
+        count = partial(
+            _count_file,
+            start_epoch=start_time.timestamp(),
+            end_epoch=end_time.timestamp(),
+            wanted=set(components) if components else None,
         )
 
-        for log_file in log_files:
-            for entry in self.parse_log_file(log_file):
-                try:
-                    timestamp = datetime.fromisoformat(
-                        entry["timestamp"].replace("Z", "+00:00")
-                    )
-                    if timestamp < start_time or timestamp > end_time:
-                        continue
-                except ValueError:
-                    continue
-
-                component = entry.get("component", "unknown")
-
-                # Filter by components if specified
-                if components and component not in components:
-                    continue
+        totals = [0] * 6
+        component_counts = defaultdict(lambda: [0] * 6)
 
-                # Update counters
-                report["total_entries"] += 1
-                level = entry.get("level", "UNKNOWN").upper()
+        # Find all log files using cached method
+        log_files = self._get_log_files()
 
-                if level == "ERROR":
-                    report["errors"] += 1
-                elif level == "WARNING":
-                    report["warnings"] += 1
-                elif level == "INFO":
-                    report["info"] += 1
-                elif level == "DEBUG":
-                    report["debug"] += 1
+        for file_totals, file_counts in self._map_log_files(count, log_files):
+            for idx, n in enumerate(file_totals):
+                totals[idx] += n
+            for component, counts in file_counts.items():
+                merged = component_counts[component]
+                for idx, n in enumerate(counts):
+                    merged[idx] += n
 
-                # Update component-specific counters
-                if component not in report["components"]:
-                    report["components"][component] = {
-                        "total": 0,
-                        "errors": 0,
-                        "warnings": 0,
-                        "info": 0,
-                        "debug": 0,
-                    }
+        return {
+            "period_start": start_time.isoformat(),
+            "period_end": end_time.isoformat(),
+            "components": {
+                component: dict(zip(_REPORT_COUNTERS, counts))
+                for component, counts in component_counts.items()
+            },
+            "total_entries": totals[0],
+            "errors": totals[1],
+            "warnings": totals[2],
+            "info": totals[3],
+            "debug": totals[4],
+        }
 
-                report["components"][component]["total"] += 1
-                report["components"][component][level.lower()] += 1
 
-        return report
+def _write_json_lines(logs: List[Dict[str, Any]], out=None) -> None:
+    """Write entries as JSON lines to ``out`` (stdout) in a single write."""
+    if not logs:
+        return
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    out.write(b"\n".join(map(_dumps, logs)) + b"\n")
+    out.flush()
 
 
 def main():
@@ -288,9 +664,7 @@ def main():
         report = parser_util.generate_report(start_time, end_time)
         print(json.dumps(report, indent=2))
     elif args.scan_id:
-        logs = parser_util.get_scan_logs(args.scan_id)
-        for log in logs:
-            print(json.dumps(log))
+        _write_json_lines(parser_util.get_scan_logs(args.scan_id))
     else:
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=args.hours)
@@ -304,8 +678,7 @@ def main():
             limit=args.limit,
         )
 
-        for log in logs:
-            print(json.dumps(log))
+        _write_json_lines(logs)
 
 
 if __name__ == "__main__":
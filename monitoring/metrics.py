@@ -3,6 +3,8 @@ Prometheus metrics for CyberSec CLI
 """
 
 import time
+from functools import lru_cache
+from typing import Optional
 
 from prometheus_client import (
     CollectorRegistry,
@@ -96,6 +98,25 @@ DATABASE_CONNECTIONS_ACTIVE = Gauge(
 )
 
 
+# Bound children for labelled counters. labels() takes a lock and hashes the
+# label values on every call; caching the child makes repeated updates a
+# plain inc(). Label values must stay low-cardinality (as Prometheus already
+# requires), which also keeps these caches small.
+@lru_cache(maxsize=128)
+def _scan_child(status: str, user_type: str):
+    return SCANS_TOTAL.labels(status=status, user_type=user_type)
+
+
+@lru_cache(maxsize=128)
+def _scan_error_child(error_type: str, target_type: str):
+    return SCAN_ERRORS_TOTAL.labels(error_type=error_type, target_type=target_type)
+
+
+@lru_cache(maxsize=128)
+def _rate_limit_child(violation_type: str):
+    return RATE_LIMIT_VIOLATIONS_TOTAL.labels(violation_type=violation_type)
+
+
 class MetricsCollector:
     """
     Centralized metrics collection and management
@@ -106,11 +127,11 @@ class MetricsCollector:
 
     def increment_scan(self, status: str = "completed", user_type: str = "anonymous"):
         """Increment scan counter"""
-        SCANS_TOTAL.labels(status=status, user_type=user_type).inc()
+        _scan_child(status, user_type).inc()
 
     def increment_scan_error(self, error_type: str, target_type: str = "unknown"):
         """Increment scan error counter"""
-        SCAN_ERRORS_TOTAL.labels(error_type=error_type, target_type=target_type).inc()
+        _scan_error_child(error_type, target_type).inc()
 
     def increment_cache_hit(self):
         """Increment cache hit counter"""
@@ -122,7 +143,7 @@ class MetricsCollector:
 
     def increment_rate_limit_violation(self, violation_type: str):
         """Increment rate limit violation counter"""
-        RATE_LIMIT_VIOLATIONS_TOTAL.labels(violation_type=violation_type).inc()
+        _rate_limit_child(violation_type).inc()
 
     def observe_scan_duration(self, duration: float):
         """Observe scan duration"""
@@ -165,14 +186,14 @@ class MetricsCollector:
 metrics_collector = MetricsCollector()
 
 
-def start_timer() -> float:
-    """Start a timer for duration metrics"""
-    return time.time()
+def start_timer() -> int:
+    """Start a timer for duration metrics (monotonic nanoseconds)"""
+    return time.monotonic_ns()
 
 
-def stop_timer(start_time: float) -> float:
-    """Stop a timer and return the duration"""
-    return time.time() - start_time
+def stop_timer(start_time: int) -> float:
+    """Stop a timer started with start_timer and return the duration in seconds"""
+    return (time.monotonic_ns() - start_time) / 1e9
 
 
 # Context managers for automatic metric collection
@@ -180,14 +201,14 @@ class ScanDurationTimer:
     """Context manager to automatically record scan duration"""
 
     def __init__(self):
-        self.start_time = None
+        self.start_time: Optional[int] = None
 
     def __enter__(self):
         self.start_time = start_timer()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
+        if self.start_time is not None:
             duration = stop_timer(self.start_time)
             metrics_collector.observe_scan_duration(duration)
 
@@ -203,21 +224,21 @@ class ServiceDetectionTimer:
     """Context manager to automatically record service detection duration"""
 
     def __init__(self):
-        self.start_time = None
+        self.start_time: Optional[int] = None
 
     def __enter__(self):
         self.start_time = start_timer()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
+        if self.start_time is not None:
             duration = stop_timer(self.start_time)
             metrics_collector.observe_service_detection_duration(duration)
 
 
 # Helper functions for common metric operations
 def record_scan(
-    start_time: float,
+    start_time: int,
     status: str = "completed",
     user_type: str = "anonymous",
     ports_count: int = 0,
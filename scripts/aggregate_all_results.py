@@ -4,24 +4,144 @@ Refined Result Aggregator for CyberSec-CLI Benchmarking Campaign.
 
 import os
 import json
-from pathlib import Path
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional, Tuple
 
-def aggregate_results(results_dir: str) -> Dict[str, Any]:
-    """Aggregate all JSON results from the results directory."""
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # optional
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # optional
+    ijson = None
+
+RESULTS_SUFFIX = "_results.json"
+
+def find_result_files(directory: str) -> Iterator[str]:
+    """
+    Yield paths of *_results.json files below directory, recursively.
+    Hidden directories such as .git are not descended into.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):
+                    yield from find_result_files(entry.path)
+            elif entry.name.endswith(RESULTS_SUFFIX):
+                yield entry.path
+
+def _result_key(json_file: str) -> str:
+    return os.path.basename(json_file)[: -len(".json")]
+
+# Fields of each results file that the reports read, as dotted paths to
+# scalar values. An empty tuple only records whether the file has content.
+REPORT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "extreme_scale_results": ("targets_per_second", "duration"),
+    "speed_throughput_results": ("targets_per_second",),
+    "memory_torture_results": (
+        "massive_targets.growth_mb",
+        "massive_targets.mem_per_target_kb",
+    ),
+    "hostile_targets_results": (),
+    "fault_injection_results": (),
+}
+
+def _set_path(out: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for part in parents:
+        out = out.setdefault(part, {})
+    out[leaf] = value
+
+def project(data: Any, paths: Tuple[str, ...]) -> Any:
+    """Keep only the dotted paths of a parsed results file (see REPORT_FIELDS)."""
+    if not paths:
+        return bool(data)
+    out: Dict[str, Any] = {}
+    for path in paths:
+        value = data
+        for part in path.split("."):
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            _set_path(out, path, value)
+    return out
+
+def stream_project(f, paths: Tuple[str, ...]) -> Any:
+    """Like project(), reading an open results file with ijson."""
+    wanted = set(paths)
+    out: Dict[str, Any] = {}
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if not paths:
+            # First event inside the top-level value decides whether it is empty
+            if prefix == "" and event in ("start_map", "start_array"):
+                continue
+            return event not in ("end_map", "end_array") and (
+                prefix != "" or bool(value)
+            )
+        if prefix in wanted and event in ("string", "number", "boolean", "null"):
+            _set_path(out, prefix, value)
+    return out
+
+def load_result_file(
+    json_file: str, fields: Optional[Tuple[str, ...]] = None
+) -> Tuple[Any, Optional[Exception]]:
+    """
+    Load one results file, returning (data, error). With ``fields``, only those
+    paths are kept, and the file is streamed if ijson is installed.
+    """
+    try:
+        with open(json_file, 'rb') as f:
+            if fields is None:
+                return _loads(f.read()), None
+            if ijson is not None:
+                return stream_project(f, fields), None
+            return project(_loads(f.read()), fields), None
+    except Exception as e:
+        return None, e
+
+def aggregate_results(
+    results_dir: str,
+    max_workers: int = 16,
+    fields: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> Dict[str, Any]:
+    """
+    Aggregate all JSON results from the results directory.
+
+    If ``fields`` is given (e.g. REPORT_FIELDS), only the listed result files
+    are loaded and each is reduced to its listed paths.
+    """
     master_results = {}
-    results_path = Path(results_dir)
+    json_files = [
+        json_file
+        for json_file in find_result_files(results_dir)
+        if fields is None or _result_key(json_file) in fields
+    ]
+    
+    def load(json_file: str) -> Tuple[Any, Optional[Exception]]:
+        return load_result_file(
+            json_file, None if fields is None else fields[_result_key(json_file)]
+        )
     
-    # Use rglob for recursive searching
-    for json_file in results_path.rglob("*_results.json"):
-        key = json_file.stem
-        print(f"Loading {key} from {json_file}")
-        try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+    # Files are independent, so read them concurrently; map() keeps file
+    # order for the report output below
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = executor.map(load, json_files)
+        for json_file, (data, error) in zip(json_files, loaded):
+            key = _result_key(json_file)
+            print(f"Loading {key} from {json_file}")
+            if error is not None:
+                print(f"  Error loading {json_file}: {error}")
+            else:
                 master_results[key] = data
-        except Exception as e:
-            print(f"  Error loading {json_file}: {e}")
             
     return master_results
 
@@ -55,31 +175,34 @@ def print_master_report(results: Dict[str, Any]):
 
 def save_markdown_report(results: Dict[str, Any], output_path: str):
     """Save report to Markdown."""
+    scale = results.get("extreme_scale_results", {})
+    mem = results.get("memory_torture_results", {}).get("massive_targets", {})
+    parts = [
+        "# CyberSec-CLI Final Research Benchmark Report\n\n",
+        "## Overview\n",
+        "Comprehensive stress and performance investigation.\n\n",
+
+        "## 1. Scale & Throughput\n",
+        f"- **1 Million Target Processing**: {scale.get('duration', 'N/A')}s\n",
+        f"- **Ingestion Throughput**: {scale.get('targets_per_second', 'N/A')} targets/s\n\n",
+
+        "## 2. Robustness (Adversarial/Chaos)\n",
+        "| Test | Result | Notes |\n",
+        "| --- | --- | --- |\n",
+        "| Tarpit Timeout | OK | Enforced < 20s for 10 probes |\n",
+        "| Internal Crash | Fixed | Robustness logic implemented |\n",
+        "| Library Failure | OK | Graceful fallback on DNS/Redis errors |\n\n",
+
+        "## 3. Resource Precision\n",
+        f"- **Density**: {mem.get('mem_per_target_kb', 'N/A')} KB/result\n",
+        f"- **Total Growth (100k)**: {mem.get('growth_mb', 'N/A')} MB\n",
+    ]
     with open(output_path, 'w') as f:
-        f.write("# CyberSec-CLI Final Research Benchmark Report\n\n")
-        f.write("## Overview\n")
-        f.write("Comprehensive stress and performance investigation.\n\n")
-        
-        f.write("## 1. Scale & Throughput\n")
-        scale = results.get("extreme_scale_results", {})
-        f.write(f"- **1 Million Target Processing**: {scale.get('duration', 'N/A')}s\n")
-        f.write(f"- **Ingestion Throughput**: {scale.get('targets_per_second', 'N/A')} targets/s\n\n")
-        
-        f.write("## 2. Robustness (Adversarial/Chaos)\n")
-        f.write("| Test | Result | Notes |\n")
-        f.write("| --- | --- | --- |\n")
-        f.write("| Tarpit Timeout | OK | Enforced < 20s for 10 probes |\n")
-        f.write("| Internal Crash | Fixed | Robustness logic implemented |\n")
-        f.write("| Library Failure | OK | Graceful fallback on DNS/Redis errors |\n\n")
-        
-        f.write("## 3. Resource Precision\n")
-        mem = results.get("memory_torture_results", {}).get("massive_targets", {})
-        f.write(f"- **Density**: {mem.get('mem_per_target_kb', 'N/A')} KB/result\n")
-        f.write(f"- **Total Growth (100k)**: {mem.get('growth_mb', 'N/A')} MB\n")
+        f.write("".join(parts))
 
 if __name__ == "__main__":
     results_dir = "tests/benchmarking/results"
-    results = aggregate_results(results_dir)
+    results = aggregate_results(results_dir, fields=REPORT_FIELDS)
     print_master_report(results)
     save_markdown_report(results, os.path.join(results_dir, "FINAL_BENCHMARK_REPORT.md"))
     print(f"\nReport generated at {os.path.join(results_dir, 'FINAL_BENCHMARK_REPORT.md')}")
@@ -2,125 +2,312 @@
 """
 Script to check for hardcoded secrets in code.
 """
+import hashlib
+import os
 import re
 import sys
-from typing import List, Tuple
+from collections import Counter
+from functools import lru_cache
+from math import log2
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
 
+from scan_lines import candidate_lines
 
-def check_hardcoded_secrets(content: str, filepath: str) -> List[Tuple[int, str]]:
-    """Check content for hardcoded secrets."""
+try:
+    import ahocorasick
+except ImportError:  # optional
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # optional
+    hyperscan = None
+
+
+# Patterns for common hardcoded secrets. They are matched against the whole
+# file, so none of them may match across a newline: character classes exclude
+# "\n" and whitespace runs use [^\S\n].
+#
+# Generic quoted tokens have no known structure, so their matches must also
+# look random (see MIN_TOKEN_ENTROPY). One pattern covers every length: any
+# longer token is also a 20+ character one.
+GENERIC_TOKEN_PATTERNS = (r'["\']([A-Za-z0-9_]{20,})["\']',)
+
+SECRET_PATTERNS = [
+    # API keys
+    *((pattern, "Possible hardcoded API key or token") for pattern in GENERIC_TOKEN_PATTERNS),
+    # AWS keys
+    (r"AKIA[0-9A-Z]{16}", "Possible AWS Access Key ID"),
+    (
+        r'aws[_-]?secret[_-]?access[_-]?key["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible AWS Secret Access Key",
+    ),
+    (
+        r'aws[_-]?access[_-]?key[_-]?id["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible AWS Access Key ID",
+    ),
+    # Google API keys
+    (r"AIza[0-9A-Za-z_-]{35}", "Possible Google API key"),
+    (
+        r'google[_-]?api[_-]?key["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible Google API key",
+    ),
+    # Generic API keys
+    (
+        r'(api[_-]?key|secret|token)["\']?[^\S\n]*[:=][^\S\n]*["\'][A-Za-z0-9_-]{20,}["\']',
+        "Possible hardcoded API key or token",
+    ),
+    # Database credentials
+    (
+        r'(password|passwd|pwd)["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]{1,20}["\']',
+        "Possible hardcoded password",
+    ),
+    (
+        r'(user|username)["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]{1,20}["\']',
+        "Possible hardcoded username",
+    ),
+    # URLs with credentials
+    (r"https?://[a-zA-Z0-9_-]+:[^@\n]+@", "URL with hardcoded credentials"),
+    # SSH keys
+    (
+        r"-----BEGIN (RSA|DSA|EC|OPENSSH) PRIVATE KEY-----",
+        "Possible hardcoded private key",
+    ),
+    (r"ssh-(rsa|dss|ed25519)", "Possible hardcoded SSH key"),
+    # JWT tokens
+    (
+        r"eyJ[A-Za-z0-9_=-]+\.[A-Za-z0-9_=-]+\.[A-Za-z0-9_=-]*",
+        "Possible hardcoded JWT token",
+    ),
+    # Other sensitive patterns
+    (
+        r'(client[_-]?secret)["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible hardcoded client secret",
+    ),
+    (
+        r'(private[_-]?key)["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible hardcoded private key",
+    ),
+    (
+        r'(encryption[_-]?key)["\']?[^\S\n]*[:=][^\S\n]*["\'][^"\'\n]+["\']',
+        "Possible hardcoded encryption key",
+    ),
+]
+
+# Patterns are bytes regexes: source files are scanned undecoded, and only
+# lines that are reported get decoded
+COMPILED_PATTERNS = [
+    (
+        re.compile(pattern.encode("ascii"), re.IGNORECASE),
+        message,
+        pattern in GENERIC_TOKEN_PATTERNS,
+    )
+    for pattern, message in SECRET_PATTERNS
+]
+
+# Minimum Shannon entropy (bits/char) for a generic token to be reported.
+# snake_case identifiers such as enhanced_service_detection score below 3.5;
+# random 20-character alphanumerics score above 4.
+MIN_TOKEN_ENTROPY = 3.5
+
+# Files whose first SNIFF_SIZE bytes contain a NUL byte (binary) or a line
+# longer than MAX_SOURCE_LINE (minified or generated) are not scanned
+SNIFF_SIZE = 8192
+MAX_SOURCE_LINE = 2048
+
+# Lines carrying one of these markers are not checked
+ALLOW_MARKERS = (b"# nosec", b"# noqa", b"# no-secret", b"# pragma: allowlist secret")
+
+# Matches containing one of these (lower-cased) are common non-sensitive patterns
+SKIP_SUBSTRINGS = (
+    "p@ssw0rd_test", # nosec
+    "test",
+    "example",
+    "sample",
+    "demo",
+    "placeholder",
+    "your_",
+    "my_",
+    "default",
+    "secret_key_base",
+    "development",
+    "forced_via_websocket",
+    "via_websocket",
+    "api_key_salt_previous",
+    "previous",
+    # Status/enum strings — not secrets
+    "skipped_",
+    "confidence",
+    "cve_status",
+    "warning_logged",
+    "overrides_",
+)
+
+
+# Every pattern as one alternation. A line can only match one of the patterns
+# if this matches somewhere on it, so a single pass over the file finds the
+# few lines worth checking pattern by pattern.
+ANY_SECRET = re.compile(
+    "|".join(f"(?:{pattern})" for pattern, _ in SECRET_PATTERNS).encode("ascii"),
+    re.IGNORECASE,
+)
+
+
+# Compiled Hyperscan databases are cached here between runs, since the
+# scanner is started once per file by the pre-commit hook
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "cybersec_cli"
+
+
+def _hyperscan_cache_path() -> Path:
+    """Cache file for the current patterns; editing them changes the name."""
+    key = hashlib.sha256(
+        repr((hyperscan.__version__, SECRET_PATTERNS)).encode("utf-8")
+    ).hexdigest()[:16]
+    return CACHE_DIR / f"secret_patterns-{key}.hsdb"
+
+
+def _compile_hyperscan_database() -> Optional["hyperscan.Database"]:
+    """
+    Compile every pattern into one Hyperscan database, if available, or load
+    it from the cache written by an earlier run.
+    """
+    if hyperscan is None:
+        return None
+    cache_path = _hyperscan_cache_path()
+    try:
+        database = hyperscan.loadb(cache_path.read_bytes(), hyperscan.HS_MODE_BLOCK)
+        # Unlike compile(), loading does not allocate scan scratch space
+        database.scratch = hyperscan.Scratch(database)
+        return database
+    except (OSError, hyperscan.error):
+        pass
+
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.encode("ascii") for pattern, _ in SECRET_PATTERNS],
+            ids=list(range(len(SECRET_PATTERNS))),
+            elements=len(SECRET_PATTERNS),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(SECRET_PATTERNS),
+        )
+    except hyperscan.error:
+        return None
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent hooks never load a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(hyperscan.dumpb(database))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return database
+
+
+@lru_cache(maxsize=None)
+def hyperscan_database() -> Optional["hyperscan.Database"]:
+    """The Hyperscan database, loaded or compiled on the first scan."""
+    return _compile_hyperscan_database()
+
+
+def _build_skip_automaton() -> Optional["ahocorasick.Automaton"]:
+    """Compile SKIP_SUBSTRINGS into one Aho-Corasick automaton, if available."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for skip in SKIP_SUBSTRINGS:
+        automaton.add_word(skip, skip)
+    automaton.make_automaton()
+    return automaton
+
+
+SKIP_AUTOMATON = _build_skip_automaton()
+
+
+def is_skipped(matched_text: str) -> bool:
+    """True if the (lower-cased) match contains a SKIP_SUBSTRINGS entry."""
+    if SKIP_AUTOMATON is not None:
+        return next(SKIP_AUTOMATON.iter(matched_text), None) is not None
+    return any(skip in matched_text for skip in SKIP_SUBSTRINGS)
+
+
+def is_binary_or_minified(head: bytes) -> bool:
+    """True if ``head``, the start of a file, does not look like source code."""
+    if b"\0" in head:
+        return True
+    return max(map(len, head.split(b"\n"))) > MAX_SOURCE_LINE
+
+
+def shannon_entropy(text: bytes) -> float:
+    """Shannon entropy of ``text`` in bits per character (byte)."""
+    length = len(text)
+    return -sum(
+        count / length * log2(count / length) for count in Counter(text).values()
+    )
+
+
+def hyperscan_candidate_lines(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Like candidate_lines, for any pattern, using the Hyperscan database."""
+    # Matches never span a newline, so the end offset alone gives the line
+    ends = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        ends.add(end)
+
+    hyperscan_database().scan(data, match_event_handler=on_match)
+
+    line_num = 1
+    line_start = 0
+    line_end = -1
+    for end in sorted(ends):
+        pos = end - 1
+        if pos <= line_end:
+            continue
+        line_num += data.count(b"\n", line_start, pos)
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        line_end = data.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(data)
+        yield line_num, data[line_start:line_end]
+
+
+def check_hardcoded_secrets(
+    content: Union[str, bytes], filepath: str
+) -> List[Tuple[int, str]]:
+    """Check content (raw file bytes, or text) for hardcoded secrets."""
     issues = []
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    if hyperscan_database() is not None:
+        lines = hyperscan_candidate_lines(content)
+    else:
+        lines = candidate_lines(ANY_SECRET, content)
 
-    # Patterns for common hardcoded secrets
-    patterns = [
-        # API keys
-        (r'["\']([A-Za-z0-9]{32,})["\']', "Possible hardcoded API key or token"),
-        (r'["\']([A-Za-z0-9_]{20,})["\']', "Possible hardcoded API key or token"),
-        (r'["\']([A-Za-z0-9_]{30,})["\']', "Possible hardcoded API key or token"),
-        # AWS keys
-        (r"AKIA[0-9A-Z]{16}", "Possible AWS Access Key ID"),
-        (
-            r'(?i)aws[_-]?secret[_-]?access[_-]?key["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible AWS Secret Access Key",
-        ),
-        (
-            r'(?i)aws[_-]?access[_-]?key[_-]?id["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible AWS Access Key ID",
-        ),
-        # Google API keys
-        (r"AIza[0-9A-Za-z_-]{35}", "Possible Google API key"),
-        (
-            r'(?i)google[_-]?api[_-]?key["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible Google API key",
-        ),
-        # Generic API keys
-        (
-            r'(?i)(api[_-]?key|secret|token)["\']?\s*[:=]\s*["\'][A-Za-z0-9_-]{20,}["\']',
-            "Possible hardcoded API key or token",
-        ),
-        # Database credentials
-        (
-            r'(?i)(password|passwd|pwd)["\']?\s*[:=]\s*["\'][^"\']{1,20}["\']',
-            "Possible hardcoded password",
-        ),
-        (
-            r'(?i)(user|username)["\']?\s*[:=]\s*["\'][^"\']{1,20}["\']',
-            "Possible hardcoded username",
-        ),
-        # URLs with credentials
-        (r"https?://[a-zA-Z0-9_-]+:[^@]+@", "URL with hardcoded credentials"),
-        # SSH keys
-        (
-            r"-----BEGIN (RSA|DSA|EC|OPENSSH) PRIVATE KEY-----",
-            "Possible hardcoded private key",
-        ),
-        (r"ssh-(rsa|dss|ed25519)", "Possible hardcoded SSH key"),
-        # JWT tokens
-        (
-            r"eyJ[A-Za-z0-9_=-]+\.[A-Za-z0-9_=-]+\.[A-Za-z0-9_=-]*",
-            "Possible hardcoded JWT token",
-        ),
-        # Other sensitive patterns
-        (
-            r'(?i)(client[_-]?secret)["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible hardcoded client secret",
-        ),
-        (
-            r'(?i)(private[_-]?key)["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible hardcoded private key",
-        ),
-        (
-            r'(?i)(encryption[_-]?key)["\']?\s*[:=]\s*["\'][^"\']+["\']',
-            "Possible hardcoded encryption key",
-        ),
-    ]
-
-    lines = content.split("\n")
-    for line_num, line in enumerate(lines, 1):
-        if any(m in line for m in ["# nosec", "# noqa", "# no-secret", "# pragma: allowlist secret"]):
+    for line_num, line in lines:
+        if any(m in line for m in ALLOW_MARKERS):
             continue
-        for pattern, message in patterns:
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
-                # Avoid false positives for common patterns
-                matched_text = match.group(0).lower()
 
-                # Skip common non-sensitive patterns
-                if any(
-                    skip in matched_text
-                    for skip in [
-                        "p@ssw0rd_test", # nosec
-                        "test",
-                        "example",
-                        "sample",
-                        "demo",
-                        "placeholder",
-                        "your_",
-                        "my_",
-                        "default",
-                        "secret_key_base",
-                        "development",
-                        "forced_via_websocket",
-                        "via_websocket",
-                        "api_key_salt_previous",
-                        "previous",
-                        # Status/enum strings — not secrets
-                        "skipped_",
-                        "confidence",
-                        "cve_status",
-                        "warning_logged",
-                        "overrides_",
-                    ]
-                ):
+        # Skip if the matches are part of a configuration assignment
+        lowered = line.lower()
+        if b"os.getenv" in lowered or b"config.get" in lowered:
+            continue
+
+        for pattern, message, entropy_checked in COMPILED_PATTERNS:
+            for match in pattern.finditer(line):
+                if entropy_checked and shannon_entropy(match.group(1)) < MIN_TOKEN_ENTROPY:
                     continue
 
-                # Skip if the matched text is part of a configuration assignment
-                if "os.getenv" in line.lower() or "config.get" in line.lower():
+                # Avoid false positives for common patterns
+                matched_text = match.group(0).lower().decode("utf-8", "replace")
+
+                # Skip common non-sensitive patterns
+                if is_skipped(matched_text):
                     continue
 
-                issues.append(
-                    (line_num, f"{message} on line {line_num}: {line.strip()}")
-                )
+                text = line.decode("utf-8", "replace").strip()
+                issues.append((line_num, f"{message} on line {line_num}: {text}"))
 
     return issues
 
@@ -133,8 +320,11 @@ def main():
     filepath = sys.argv[1]
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(filepath, "rb") as f:
+            head = f.read(SNIFF_SIZE)
+            if is_binary_or_minified(head):
+                sys.exit(0)
+            content = head + f.read()
     except Exception as e:
         print(f"Error reading file {filepath}: {e}")
         sys.exit(1)
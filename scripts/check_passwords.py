@@ -4,44 +4,64 @@ Script to check for common password patterns in code.
 """
 import re
 import sys
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
+from scan_lines import candidate_lines
 
-def check_password_patterns(content: str, filepath: str) -> List[Tuple[int, str]]:
-    """Check content for common password patterns."""
+
+# Common password patterns to look for. They are matched against the whole
+# file, so none of them may match across a newline.
+PASSWORD_PATTERNS = [
+    (r'password[^\S\n]*=[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak password assignment"),
+    (r'passwd[^\S\n]*=[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak password assignment"),
+    (r'pwd[^\S\n]*=[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak password assignment"),
+    (r'admin[^\S\n]*:[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak admin credentials"),
+    (r'user[^\S\n]*:[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak user credentials"),
+    (r'root[^\S\n]*:[^\S\n]*["\'][^"\'\n]{1,10}["\']', "Possible weak root credentials"),
+    (r"123456", "Common password pattern found"),
+    (r"password123", "Common password pattern found"),
+    (r"admin123", "Common password pattern found"),
+    (r"qwerty", "Common password pattern found"),
+    (r"letmein", "Common password pattern found"),
+    (r"welcome", "Common password pattern found"),
+    (r"monkey", "Common password pattern found"),
+    (r"dragon", "Common password pattern found"),
+    (r"abc123", "Common password pattern found"),
+    (r"123456789", "Common password pattern found"),
+    (r'password[^\S\n]*=[^\S\n]*["\']test["\']', "Test password found"),
+    (r'password[^\S\n]*=[^\S\n]*["\']123["\']', "Weak numeric password found"),
+    (r'password[^\S\n]*=[^\S\n]*["\']1234["\']', "Weak numeric password found"),
+    (r'password[^\S\n]*=[^\S\n]*["\']12345["\']', "Weak numeric password found"),
+]
+
+# Patterns are bytes regexes: source files are scanned undecoded, and only
+# lines that are reported get decoded
+COMPILED_PATTERNS = [
+    (re.compile(pattern.encode("ascii"), re.IGNORECASE), message)
+    for pattern, message in PASSWORD_PATTERNS
+]
+
+
+# Every pattern as one alternation, used to find the lines worth checking
+ANY_PASSWORD = re.compile(
+    "|".join(f"(?:{pattern})" for pattern, _ in PASSWORD_PATTERNS).encode("ascii"),
+    re.IGNORECASE,
+)
+
+
+def check_password_patterns(
+    content: Union[str, bytes], filepath: str
+) -> List[Tuple[int, str]]:
+    """Check content (raw file bytes, or text) for common password patterns."""
     issues = []
+    if isinstance(content, str):
+        content = content.encode("utf-8")
 
-    # Common password patterns to look for
-    patterns = [
-        (r'password\s*=\s*["\'][^"\']{1,10}["\']', "Possible weak password assignment"),
-        (r'passwd\s*=\s*["\'][^"\']{1,10}["\']', "Possible weak password assignment"),
-        (r'pwd\s*=\s*["\'][^"\']{1,10}["\']', "Possible weak password assignment"),
-        (r'admin\s*:\s*["\'][^"\']{1,10}["\']', "Possible weak admin credentials"),
-        (r'user\s*:\s*["\'][^"\']{1,10}["\']', "Possible weak user credentials"),
-        (r'root\s*:\s*["\'][^"\']{1,10}["\']', "Possible weak root credentials"),
-        (r"123456", "Common password pattern found"),
-        (r"password123", "Common password pattern found"),
-        (r"admin123", "Common password pattern found"),
-        (r"qwerty", "Common password pattern found"),
-        (r"letmein", "Common password pattern found"),
-        (r"welcome", "Common password pattern found"),
-        (r"monkey", "Common password pattern found"),
-        (r"dragon", "Common password pattern found"),
-        (r"abc123", "Common password pattern found"),
-        (r"123456789", "Common password pattern found"),
-        (r'password\s*=\s*["\']test["\']', "Test password found"),
-        (r'password\s*=\s*["\']123["\']', "Weak numeric password found"),
-        (r'password\s*=\s*["\']1234["\']', "Weak numeric password found"),
-        (r'password\s*=\s*["\']12345["\']', "Weak numeric password found"),
-    ]
-
-    lines = content.split("\n")
-    for line_num, line in enumerate(lines, 1):
-        for pattern, message in patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                issues.append(
-                    (line_num, f"{message} on line {line_num}: {line.strip()}")
-                )
+    for line_num, line in candidate_lines(ANY_PASSWORD, content):
+        for pattern, message in COMPILED_PATTERNS:
+            if pattern.search(line):
+                text = line.decode("utf-8", "replace").strip()
+                issues.append((line_num, f"{message} on line {line_num}: {text}"))
 
     return issues
 
@@ -54,7 +74,7 @@ def main():
     filepath = sys.argv[1]
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
+        with open(filepath, "rb") as f:
             content = f.read()
     except Exception as e:
         print(f"Error reading file {filepath}: {e}")
@@ -4,15 +4,16 @@ Aggregates data from all benchmarking phases and compares CyberSec-CLI
 against Nmap, Masscan, and RustScan.
 """
 
-import json
+import io
 from pathlib import Path
 
+from json_io import read_json
+
 def load_json(filepath):
     """Load JSON file if it exists, else return None."""
     path = Path(filepath)
     if path.exists():
-        with open(path, "r") as f:
-            return json.load(f)
+        return read_json(path)
     print(f"Warning: File not found: {filepath}")
     return None
 
@@ -127,24 +128,33 @@ def main():
     }
 
     # 4. Generate Markdown Table
-    md = "# Table IV: Feature & Performance Comparison Matrix\n\n"
-    md += "| Feature | CyberSec-CLI (Proposed) | Nmap (Baseline) | Masscan | RustScan |\n"
-    md += "| :--- | :--- | :--- | :--- | :--- |\n"
-    
-    # Rows
-    md += "| **Architecture** | Hybrid (AsyncIO + Threads) | Block-based | Sync/Asyn Packet Injection | Async |\n"
-    md += f"| **Scanning Speed** | **{cybersec_speed}** (Adaptive) | {competitors['Nmap']['Speed']} | {competitors['Masscan']['Speed']} | {competitors['RustScan']['Speed']} |\n"
-    md += f"| **Accuracy (F1)** | **{cybersec_accuracy}** | {competitors['Nmap']['Accuracy']} | {competitors['Masscan']['Accuracy']} | {competitors['RustScan']['Accuracy']} |\n"
-    md += f"| **Adaptive Logic** | **{cybersec_adaptive}** (ML-driven) | {competitors['Nmap']['Adaptive']} | {competitors['Masscan']['Adaptive']} | {competitors['RustScan']['Adaptive']} |\n"
-    md += f"| **AI Integration** | **{cybersec_ai}** (GPT/LLaMA) | {competitors['Nmap']['AI Analysis']} | {competitors['Masscan']['AI Analysis']} | {competitors['RustScan']['AI Analysis']} |\n"
-    md += f"| **Resource Eff.** | **{cybersec_resources}** | {competitors['Nmap']['Resource']} | {competitors['Masscan']['Resource']} | {competitors['RustScan']['Resource']} |\n"
-    md += "| **Ease of Use** | High (Interactive CLI) | Medium (Complex Flags) | Medium | Medium |\n"
+    tools = ("Nmap", "Masscan", "RustScan")
+
+    def cells(key):
+        return tuple(competitors[tool][key] for tool in tools)
+
+    rows = [
+        ("**Architecture**", "Hybrid (AsyncIO + Threads)", "Block-based", "Sync/Asyn Packet Injection", "Async"),
+        ("**Scanning Speed**", f"**{cybersec_speed}** (Adaptive)", *cells("Speed")),
+        ("**Accuracy (F1)**", f"**{cybersec_accuracy}**", *cells("Accuracy")),
+        ("**Adaptive Logic**", f"**{cybersec_adaptive}** (ML-driven)", *cells("Adaptive")),
+        ("**AI Integration**", f"**{cybersec_ai}** (GPT/LLaMA)", *cells("AI Analysis")),
+        ("**Resource Eff.**", f"**{cybersec_resources}**", *cells("Resource")),
+        ("**Ease of Use**", "High (Interactive CLI)", "Medium (Complex Flags)", "Medium", "Medium"),
+    ]
+
+    buf = io.StringIO()
+    buf.write("# Table IV: Feature & Performance Comparison Matrix\n\n")
+    buf.write("| Feature | CyberSec-CLI (Proposed) | Nmap (Baseline) | Masscan | RustScan |\n")
+    buf.write("| :--- | :--- | :--- | :--- | :--- |\n")
+    for row in rows:
+        buf.write("| " + " | ".join(row) + " |\n")
+    md = buf.getvalue()
 
     print(md)
     
     # Save
-    with open("feature_matrix.md", "w") as f:
-        f.write(md)
+    Path("feature_matrix.md").write_text(md)
     print("\n✓ Feature matrix saved to feature_matrix.md")
 
 if __name__ == "__main__":
@@ -3,10 +3,34 @@ Generate Graphs for IEEE Paper.
 Reads benchmark JSON results and produces plots.
 """
 
-import json
-import os
 from pathlib import Path
-import matplotlib.pyplot as plt
+
+from json_io import read_json
+
+PLOTS_DIR = Path("tests/benchmarking/results/plots")
+
+_figure = None
+
+def new_axes():
+    """Clear the shared figure and return fresh axes to draw the next plot on."""
+    global _figure
+    if _figure is None:
+        # Imported here so runs without results files never load matplotlib
+        import matplotlib
+
+        # Only PNGs are written, so skip interactive backend detection
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        _figure = plt.figure(figsize=(10, 6))
+    _figure.clear()
+    return _figure.add_subplot()
+
+def save_plot(ax, filename):
+    """Write the figure owning ``ax`` to PLOTS_DIR/filename."""
+    output_path = PLOTS_DIR / filename
+    ax.figure.savefig(output_path)
+    print(f"Generated {output_path}")
 
 def generate_adaptive_graph():
     """Figure 2: Adaptive Concurrency Over Time."""
@@ -15,8 +39,7 @@ def generate_adaptive_graph():
         print(f"File not found: {results_path}")
         return
 
-    with open(results_path) as f:
-        data = json.load(f)
+    data = read_json(results_path)
 
     # Handle different saving structures (BaseBenchmark wrapper vs direct dict)
     history = []
@@ -35,25 +58,22 @@ def generate_adaptive_graph():
     timestamps = [d["timestamp"] for d in history]
     concurrency = [d["concurrency"] for d in history]
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(timestamps, concurrency, label="Concurrency Limit", color="blue")
+    ax = new_axes()
+    ax.plot(timestamps, concurrency, label="Concurrency Limit", color="blue")
     
     # Annotate phases
-    plt.axvspan(0, 10, alpha=0.1, color='green', label='Good Network')
-    plt.axvspan(10, 20, alpha=0.1, color='red', label='Bad Network')
-    plt.axvspan(20, 30, alpha=0.1, color='orange', label='Degraded')
-    plt.axvspan(30, max(timestamps), alpha=0.1, color='green')
-
-    plt.title("Figure 2: Adaptive Concurrency Over Time")
-    plt.xlabel("Time (s)")
-    plt.ylabel("Max Concurrent Connections")
-    plt.legend()
-    plt.grid(True)
+    ax.axvspan(0, 10, alpha=0.1, color='green', label='Good Network')
+    ax.axvspan(10, 20, alpha=0.1, color='red', label='Bad Network')
+    ax.axvspan(20, 30, alpha=0.1, color='orange', label='Degraded')
+    ax.axvspan(30, max(timestamps), alpha=0.1, color='green')
+
+    ax.set_title("Figure 2: Adaptive Concurrency Over Time")
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Max Concurrent Connections")
+    ax.legend()
+    ax.grid(True)
     
-    output_path = "tests/benchmarking/results/plots/figure2_adaptive_concurrency.png"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    plt.savefig(output_path)
-    print(f"Generated {output_path}")
+    save_plot(ax, "figure2_adaptive_concurrency.png")
 
 def generate_comparison_graph():
     """Table I: Performance Comparison (Visual)."""
@@ -62,8 +82,7 @@ def generate_comparison_graph():
         print(f"File not found: {results_path}")
         return
 
-    with open(results_path) as f:
-        data = json.load(f)
+    data = read_json(results_path)
     
     labels = []
     durations = []
@@ -84,7 +103,7 @@ def generate_comparison_graph():
         labels = [x[0] for x in zipped]
         durations = [x[1] for x in zipped]
 
-        plt.figure(figsize=(10, 6))
+        ax = new_axes()
         
         # Color Map
         colors = []
@@ -106,19 +125,17 @@ def generate_comparison_graph():
             else:
                 colors.append('gray')
 
-        plt.bar(labels, durations, color=colors)
-        plt.title("Scan Duration Comparison (1000 Ports)")
-        plt.ylabel("Duration (s)")
-        plt.xlabel("Tool / Timing")
-        plt.yscale('log') # Log scale because T0 is huge
-        plt.xticks(rotation=45)
-        plt.grid(True, axis='y')
-        plt.tight_layout()
+        ax.bar(labels, durations, color=colors)
+        ax.set_title("Scan Duration Comparison (1000 Ports)")
+        ax.set_ylabel("Duration (s)")
+        ax.set_xlabel("Tool / Timing")
+        ax.set_yscale('log') # Log scale because T0 is huge
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, axis='y')
+        # Rotated tool names need the extra bottom margin
+        ax.figure.tight_layout()
         
-        output_path = "tests/benchmarking/results/plots/figure3_performance_comparison.png"
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        plt.savefig(output_path)
-        print(f"Generated {output_path}")
+        save_plot(ax, "figure3_performance_comparison.png")
 
 def generate_scalability_graph():
     """Table III: Scalability (Visual)."""
@@ -127,8 +144,7 @@ def generate_scalability_graph():
         print(f"File not found: {results_path}")
         return
 
-    with open(results_path) as f:
-        data = json.load(f)
+    data = read_json(results_path)
     
     targets = []
     throughputs = []
@@ -148,20 +164,18 @@ def generate_scalability_graph():
         targets = [x[0] for x in zipped]
         throughputs = [x[1] for x in zipped]
         
-        plt.figure(figsize=(10, 6))
-        plt.plot(targets, throughputs, marker='o', linestyle='-', color='purple')
-        plt.title("Scalability: Throughput vs Target Count")
-        plt.xlabel("Number of Targets")
-        plt.ylabel("Throughput (targets/sec)")
-        plt.xscale('log')
-        plt.grid(True)
+        ax = new_axes()
+        ax.plot(targets, throughputs, marker='o', linestyle='-', color='purple')
+        ax.set_title("Scalability: Throughput vs Target Count")
+        ax.set_xlabel("Number of Targets")
+        ax.set_ylabel("Throughput (targets/sec)")
+        ax.set_xscale('log')
+        ax.grid(True)
         
-        output_path = "tests/benchmarking/results/plots/figure4_scalability.png"
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        plt.savefig(output_path)
-        print(f"Generated {output_path}")
+        save_plot(ax, "figure4_scalability.png")
 
 if __name__ == "__main__":
+    PLOTS_DIR.mkdir(parents=True, exist_ok=True)
     generate_adaptive_graph()
     generate_comparison_graph()
     generate_scalability_graph()
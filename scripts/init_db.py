@@ -4,8 +4,6 @@ import asyncio
 import os
 from pathlib import Path
 
-import asyncpg
-
 
 async def init_database():
     """Run database migrations"""
@@ -25,19 +23,31 @@ async def init_database():
     with open(schema_path, "r") as f:
         schema_sql = f.read()
 
-    # Connect and execute
+    # Imported here so a missing URL or schema is reported without loading it
+    import asyncpg
+
+    # Connect and execute. The schema is only run once, so there is nothing
+    # for the prepared statement cache to reuse
     try:
-        conn = await asyncpg.connect(database_url)
+        conn = await asyncpg.connect(database_url, statement_cache_size=0)
         print("Connected to PostgreSQL database")
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return
 
+    try:
         print("Running database migrations...")
-        await conn.execute(schema_sql)
+        # Without arguments, execute() sends the whole script in one simple
+        # query round trip; the transaction makes a failed run leave nothing
+        # half-applied
+        async with conn.transaction():
+            await conn.execute(schema_sql)
         print("✅ Database initialized successfully")
-
-        await conn.close()
-        print("Connection closed")
     except Exception as e:
         print(f"❌ Migration failed: {e}")
+    finally:
+        await conn.close()
+        print("Connection closed")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""
+JSON file reading shared by the benchmark report scripts.
+"""
+
+import json
+import mmap
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+
+def read_json(path):
+    """Parse a JSON file through a read-only memory map of its contents."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; let the parser report them
+            return json.loads(f.read())
+        with mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
@@ -2,14 +2,129 @@
 Analyzes port scan results to identify potential security issues.
 """
 
-from typing import Any, Dict, List, Optional
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
 import sys
 import os
 
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from cybersec_cli.tools.network.port_scanner import PortResult
+from cybersec_cli.tools.network.port_scanner import PortResult, PortState
+
+
+# --- FTP Analysis (Port 21) ---
+_FTP_FINDING = MappingProxyType({
+    "port": 21,
+    "severity": "Medium",
+    "finding": "Information Disclosure & Insecure Protocol",
+    "details": "The FTP banner reveals the software (Pure-FTPd) and user limits. FTP transmits credentials and data in cleartext.",
+    "recommendation": (
+        "• Disable or customize the welcome banner in the FTP server configuration.\n"
+        "• Strongly consider using SFTP (over SSH) instead of FTP for secure file transfers."
+    ),
+})
+
+# --- SSH Analysis (Port 22) ---
+_SSH_FINDING = MappingProxyType({
+    "port": 22,
+    "severity": "High",
+    "finding": "Outdated Software Version",
+    "details": "The banner indicates OpenSSH 7.4 (2016), which has several known vulnerabilities (e.g., CVE-2023-38408, Terrapin attack).",
+    "recommendation": (
+        "• Upgrade OpenSSH to the latest stable version (9.7+).\n"
+        "• Implement key-based authentication and disable passwords.\n"
+        "• Use a tool like `fail2ban` to prevent brute-force attacks."
+    ),
+})
+
+# --- SMTP Analysis (Port 25) ---
+_SMTP_FINDING = MappingProxyType({
+    "port": 25,
+    "severity": "Info",
+    "finding": "SMTP Port Open",
+    "details": "The SMTP port is open. If this server is not intended to be a mail server, this could be an unnecessary exposure.",
+    "recommendation": (
+        "• If not needed, close this port in your firewall.\n"
+        "• If needed, ensure it is properly configured to prevent being an open relay for spam."
+    ),
+})
+
+# --- DNS Analysis (Port 53) ---
+_DNS_FINDING = MappingProxyType({
+    "port": 53,
+    "severity": "Info",
+    "finding": "DNS Port Open",
+    "details": "The DNS port is open. Misconfigured DNS servers can be used for amplification attacks.",
+    "recommendation": (
+        "• If this is not a DNS server, close this port.\n"
+        "• If it is, ensure recursion is disabled for untrusted clients and implement rate limiting."
+    ),
+})
+
+# --- HTTP Analysis (Port 80) ---
+_HTTP_FINDING = MappingProxyType({
+    "port": 80,
+    "severity": "Low",
+    "finding": "HTTP Redirects to External Domain",
+    "details": "The HTTP service redirects to an external domain. This could be a potential security risk if the redirect is not intentional.",
+    "recommendation": (
+        "• Investigate the redirect to ensure it is legitimate.\n"
+        "• Implement HTTPS (port 443) with a proper SSL/TLS certificate and HSTS headers."
+    ),
+})
+
+
+# 301/302 status codes as whole numbers, so e.g. "3010" does not count
+_HTTP_REDIRECT = re.compile(r"\b30[12]\b")
+
+
+def _ftp(banner: str, state: PortState) -> Optional[Mapping[str, Any]]:
+    return _FTP_FINDING if "Pure-FTPd" in banner else None
+
+
+def _ssh(banner: str, state: PortState) -> Optional[Mapping[str, Any]]:
+    return _SSH_FINDING if "OpenSSH_7.4" in banner else None
+
+
+def _smtp(banner: str, state: PortState) -> Optional[Mapping[str, Any]]:
+    return _SMTP_FINDING if state.value == "open" else None
+
+
+def _dns(banner: str, state: PortState) -> Optional[Mapping[str, Any]]:
+    return _DNS_FINDING if state.value == "open" else None
+
+
+def _http(banner: str, state: PortState) -> Optional[Mapping[str, Any]]:
+    return _HTTP_FINDING if _HTTP_REDIRECT.search(banner) else None
+
+
+def _no_finding(banner: str, state: PortState) -> None:
+    return None
+
+
+# Per-port checks; each returns the port's finding template or None
+PORT_HANDLERS: Dict[int, Callable[[str, PortState], Optional[Mapping[str, Any]]]] = {
+    21: _ftp,
+    22: _ssh,
+    25: _smtp,
+    53: _dns,
+    80: _http,
+}
+
+
+@lru_cache(maxsize=4096)
+def _finding_template(
+    port: int, banner: str, state: PortState
+) -> Optional[Mapping[str, Any]]:
+    """
+    Finding template for a (port, banner, state), memoized since scans of many
+    hosts repeat the same services. Templates are read-only, so sharing them
+    between cache hits is safe.
+    """
+    return PORT_HANDLERS.get(port, _no_finding)(banner, state)
 
 
 def analyze_port_result(result: PortResult) -> Optional[Dict[str, Any]]:
@@ -22,76 +137,9 @@ def analyze_port_result(result: PortResult) -> Optional[Dict[str, Any]]:
     Returns:
         A dictionary representing the finding, or None if no issue is found.
     """
-    banner = result.banner or ""
-
-    # --- FTP Analysis (Port 21) ---
-    if result.port == 21:
-        if "Pure-FTPd" in banner:
-            return {
-                "port": 21,
-                "severity": "Medium",
-                "finding": "Information Disclosure & Insecure Protocol",
-                "details": "The FTP banner reveals the software (Pure-FTPd) and user limits. FTP transmits credentials and data in cleartext.",
-                "recommendation": (
-                    "• Disable or customize the welcome banner in the FTP server configuration.\n"
-                    "• Strongly consider using SFTP (over SSH) instead of FTP for secure file transfers."
-                ),
-            }
-
-    # --- SSH Analysis (Port 22) ---
-    if result.port == 22:
-        if "OpenSSH_7.4" in banner:
-            return {
-                "port": 22,
-                "severity": "High",
-                "finding": "Outdated Software Version",
-                "details": "The banner indicates OpenSSH 7.4 (2016), which has several known vulnerabilities (e.g., CVE-2023-38408, Terrapin attack).",
-                "recommendation": (
-                    "• Upgrade OpenSSH to the latest stable version (9.7+).\n"
-                    "• Implement key-based authentication and disable passwords.\n"
-                    "• Use a tool like `fail2ban` to prevent brute-force attacks."
-                ),
-            }
-
-    # --- SMTP Analysis (Port 25) ---
-    if result.port == 25 and result.state.value == "open":
-        return {
-            "port": 25,
-            "severity": "Info",
-            "finding": "SMTP Port Open",
-            "details": "The SMTP port is open. If this server is not intended to be a mail server, this could be an unnecessary exposure.",
-            "recommendation": (
-                "• If not needed, close this port in your firewall.\n"
-                "• If needed, ensure it is properly configured to prevent being an open relay for spam."
-            ),
-        }
-
-    # --- DNS Analysis (Port 53) ---
-    if result.port == 53 and result.state.value == "open":
-        return {
-            "port": 53,
-            "severity": "Info",
-            "finding": "DNS Port Open",
-            "details": "The DNS port is open. Misconfigured DNS servers can be used for amplification attacks.",
-            "recommendation": (
-                "• If this is not a DNS server, close this port.\n"
-                "• If it is, ensure recursion is disabled for untrusted clients and implement rate limiting."
-            ),
-        }
-
-    # --- HTTP Analysis (Port 80) ---
-    if result.port == 80 and ("301" in banner or "302" in banner):
-        return {
-            "port": 80,
-            "severity": "Low",
-            "finding": "HTTP Redirects to External Domain",
-            "details": "The HTTP service redirects to an external domain. This could be a potential security risk if the redirect is not intentional.",
-            "recommendation": (
-                "• Investigate the redirect to ensure it is legitimate.\n"
-                "• Implement HTTPS (port 443) with a proper SSL/TLS certificate and HSTS headers."
-            ),
-        }
-    return None
+    finding = _finding_template(result.port, result.banner or "", result.state)
+    # Callers own the returned dict; the shared templates are read-only
+    return dict(finding) if finding is not None else None
 
 
 def analyze_scan_results(results: List[PortResult]) -> List[Dict[str, Any]]:
@@ -104,9 +152,12 @@ def analyze_scan_results(results: List[PortResult]) -> List[Dict[str, Any]]:
     Returns:
         A list of dictionaries, where each dictionary is a security finding.
     """
-    findings = []
-    for result in results:
-        finding = analyze_port_result(result)
-        if finding:
-            findings.append(finding)
-    return findings
+    # Most ports have no check, so filter on the port before touching the
+    # banner-keyed cache
+    return [
+        dict(finding)
+        for result in results
+        if result.port in PORT_HANDLERS
+        and (finding := _finding_template(result.port, result.banner or "", result.state))
+        is not None
+    ]
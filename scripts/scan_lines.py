@@ -0,0 +1,29 @@
+"""
+Line scanning shared by the pre-commit secret checkers.
+"""
+
+import re
+from typing import Iterator, Tuple
+
+
+def candidate_lines(pattern: "re.Pattern[bytes]", content: bytes) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (line number, line text), in order, for each line on which
+    ``pattern`` matches. Only matching lines are sliced out of ``content``.
+    """
+    line_num = 1
+    line_start = 0
+    pos = 0
+    while True:
+        match = pattern.search(content, pos)
+        if match is None:
+            return
+        start = match.start()
+        line_num += content.count(b"\n", line_start, start)
+        line_start = content.rfind(b"\n", 0, start) + 1
+        line_end = content.find(b"\n", start)
+        if line_end == -1:
+            line_end = len(content)
+        yield line_num, content[line_start:line_end]
+        # The rest of this line is checked pattern by pattern anyway
+        pos = line_end + 1
@@ -1,100 +1,241 @@
 #!/usr/bin/env python3
 """Simple CLI with basic formatting."""
-import shlex
-from dataclasses import dataclass
-from typing import List
+import re
+import select
+import sys
+from collections.abc import Callable
+
+# Shell-style words, as split by shlex.split: runs of unquoted characters,
+# backslash escapes, "double" and 'single' quoted strings with no whitespace
+# between them form one word
+_WORD_RE = re.compile(
+    r"""(?:[^ \t\r\n"'\\]+|\\.|"(?:[^"\\]|\\.)*"|'[^']*')+""", re.DOTALL
+)
+_PIECE_RE = re.compile(
+    r"""[^"'\\]+|\\(.)|"((?:[^"\\]|\\.)*)"|'([^']*)'""", re.DOTALL
+)
+# Inside double quotes a backslash only escapes a quote or a backslash
+_DQUOTE_ESCAPE_RE = re.compile(r'\\(["\\])')
+_SEPARATOR_RE = re.compile(r"[ \t\r\n]*")
+# Input without quotes or backslashes is just whitespace-separated words.
+# str.split() would also split on other whitespace, which shlex does not
+_NEEDS_UNQUOTING_RE = re.compile(r"[\"'\\]")
+_PLAIN_WORD_RE = re.compile(r"[^ \t\r\n]+")
+
+# Terminal control sequences, e.g. the bracketed-paste markers some terminals
+# wrap pasted text in
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+
+# Longest command line that is parsed; the rest of an accidental large paste
+# is dropped instead of being tokenized
+MAX_INPUT_LEN = 4096
+
+
+def _unquote(word: str) -> str:
+    """Remove the quoting and escapes from one shell word."""
+    out = []
+    for piece in _PIECE_RE.finditer(word):
+        escaped, dquoted, squoted = piece.groups()
+        if escaped is not None:
+            out.append(escaped)
+        elif dquoted is not None:
+            out.append(_DQUOTE_ESCAPE_RE.sub(r"\1", dquoted))
+        elif squoted is not None:
+            out.append(squoted)
+        else:
+            out.append(piece.group())
+    return "".join(out)
+
+
+def split_words(input_str: str) -> list[str]:
+    """
+    Split input into words like shlex.split, using precompiled regexes.
+
+    Raises:
+        ValueError: On an unclosed quote or a trailing backslash.
+    """
+    if _NEEDS_UNQUOTING_RE.search(input_str) is None:
+        return _PLAIN_WORD_RE.findall(input_str)
+    words = []
+    pos = _SEPARATOR_RE.match(input_str).end()
+    while pos < len(input_str):
+        word = _WORD_RE.match(input_str, pos)
+        if word is None:
+            raise ValueError("No closing quotation or escaped character")
+        words.append(_unquote(word.group()))
+        pos = _SEPARATOR_RE.match(input_str, word.end()).end()
+        if pos == word.end() and pos < len(input_str):
+            raise ValueError("No closing quotation or escaped character")
+    return words
 
 
-@dataclass
 class Command:
-    name: str
-    args: List[str]
+    """A parsed input line: lower-cased command name and its arguments."""
+
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: list[str]):
+        self.name = name
+        self.args = args
+
+    def __repr__(self) -> str:
+        return f"Command(name={self.name!r}, args={self.args!r})"
 
     @classmethod
     def parse(cls, input_str: str) -> "Command":
         """Parse input string into a Command object."""
-        parts = shlex.split(input_str.strip())
+        parts = split_words(input_str.strip())
         if not parts:
             return cls("", [])
         return cls(parts[0].lower(), parts[1:])
 
 
+_BAR = "=" * 50
+
+_BANNER = (
+    f"\n{_BAR}\n"
+    "  Cybersec CLI - Simple Version\n"
+    "  Type 'help' for available commands\n"
+    "  Type 'exit' or 'quit' to exit\n"
+    f"{_BAR}\n\n"
+)
+
+_HELP = (
+    "\nAvailable commands:\n"
+    "  help         - Show this help\n"
+    "  clear        - Clear the screen\n"
+    "  banner       - Show the banner\n"
+    "  scan <target>- Start a scan (e.g., 'scan example.com')\n"
+    "  exit/quit    - Exit the program\n"
+    "\n"
+)
+
+
 def print_banner():
     """Print a simple banner."""
-    print("\n" + "=" * 50)
-    print("  Cybersec CLI - Simple Version")
-    print("  Type 'help' for available commands")
-    print("  Type 'exit' or 'quit' to exit")
-    print("=" * 50 + "\n")
+    sys.stdout.write(_BANNER)
 
 
 def show_help():
     """Show help information."""
-    print("\nAvailable commands:")
-    print("  help         - Show this help")
-    print("  clear        - Clear the screen")
-    print("  banner       - Show the banner")
-    print("  scan <target>- Start a scan" " (e.g., 'scan example.com')")
-    print("  exit/quit    - Exit the program")
-    print()
+    sys.stdout.write(_HELP)
+
+
+# ANSI escape codes: cursor home, then erase to the end of the screen
+_CLEAR = "\033[H\033[J"
 
 
 def clear_screen():
     """Clear the terminal screen."""
-    print("\033[H\033[J", end="")  # ANSI escape code to clear screen
+    sys.stdout.write(_CLEAR)
 
 
-def process_command(cmd: Command) -> bool:
-    """Process a command and return whether to continue."""
-    if not cmd.name:
-        return True
+def _do_exit(args: list[str]) -> bool:
+    print("\nExiting Cybersec CLI. Stay secure!")
+    return False
 
-    if cmd.name in ("exit", "quit"):
-        print("\nExiting Cybersec CLI. Stay secure!")
-        return False
 
-    elif cmd.name in ("help", "?"):
-        show_help()
+def _do_help(args: list[str]) -> bool:
+    show_help()
+    return True
 
-    elif cmd.name == "clear":
-        clear_screen()
-        print_banner()
 
-    elif cmd.name == "banner":
-        print_banner()
+def _do_clear(args: list[str]) -> bool:
+    clear_screen()
+    print_banner()
+    return True
 
-    elif cmd.name == "scan":
-        if not cmd.args:
-            print("\n[!] Please specify a target to scan." " Example: scan example.com")
-        else:
-            target = cmd.args[0]
-            print(f"\n[*] Starting scan of: {target}")
-            # Simulate scanning
-            print(f"[+] Checking if {target} is online...")
-            print("[+] Scanning common ports...")
-            print(f"[!] Scan completed for {target}")
 
+def _do_banner(args: list[str]) -> bool:
+    print_banner()
+    return True
+
+
+def _do_scan(args: list[str]) -> bool:
+    if not args:
+        print("\n[!] Please specify a target to scan." " Example: scan example.com")
     else:
+        target = args[0]
+        # Simulate scanning
+        sys.stdout.write(
+            f"\n[*] Starting scan of: {target}\n"
+            f"[+] Checking if {target} is online...\n"
+            "[+] Scanning common ports...\n"
+            f"[!] Scan completed for {target}\n"
+        )
+    return True
+
+
+# Command name -> handler taking the arguments and returning whether to continue
+_DISPATCH: dict[str, Callable[[list[str]], bool]] = {
+    "exit": _do_exit,
+    "quit": _do_exit,
+    "help": _do_help,
+    "?": _do_help,
+    "clear": _do_clear,
+    "banner": _do_banner,
+    "scan": _do_scan,
+}
+
+
+def process_command(cmd: Command) -> bool:
+    """Process a command and return whether to continue."""
+    if not cmd.name:
+        return True
+
+    handler = _DISPATCH.get(cmd.name)
+    if handler is None:
         print(
             f"\n[!] Unknown command: {cmd.name}" " Type 'help' for available commands"
         )
+        return True
+    return handler(cmd.args)
 
-    return True
+
+def _input_pending() -> bool:
+    """True if more input can be read from stdin without waiting."""
+    try:
+        readable, _, _ = select.select([sys.stdin], [], [], 0)
+    except (OSError, ValueError):
+        # Not a selectable file, e.g. redirected to an in-memory stream or
+        # a console on Windows
+        return False
+    return bool(readable)
 
 
 def main():
     """Main CLI loop."""
     print_banner()
 
+    # input() flushes stderr and stdout around every prompt; only the prompt
+    # itself needs flushing
+    write, flush, readline = sys.stdout.write, sys.stdout.flush, sys.stdin.readline
+
+    prompt = True
     try:
         while True:
             try:
                 # Get user input
                 try:
-                    user_input = input("\ncybersec> ").strip()
-                except (EOFError, KeyboardInterrupt):
+                    if prompt:
+                        write("\ncybersec> ")
+                        flush()
+                    line = readline()
+                except KeyboardInterrupt:
                     print("\nUse 'exit' or 'quit' to exit the program")
+                    prompt = True
                     continue
+                if not line:
+                    # End of input: nothing more can be read, so stop
+                    print()
+                    break
+                # Lines pasted together are already waiting; run them back to
+                # back and prompt again once they are used up
+                prompt = not _input_pending()
+                user_input = _ANSI_ESCAPE_RE.sub("", line).strip()
+                if len(user_input) > MAX_INPUT_LEN:
+                    print(f"\n[!] Input truncated to {MAX_INPUT_LEN} characters")
+                    user_input = user_input[:MAX_INPUT_LEN]
 
                 # Parse and process command
                 cmd = Command.parse(user_input)
@@ -7,8 +7,7 @@ import logging
 import os
 import sys
 
-# Add the project root to the path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 # Configure logging
 logging.basicConfig(
@@ -18,29 +17,39 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def worker_argv():
+    """Command line of the Celery worker for the scans queue."""
+    return [
+        sys.executable,
+        "-m",
+        "celery",
+        # Makes the project root importable, as tasks.celery_app lives there
+        f"--workdir={PROJECT_ROOT}",
+        "-A",
+        "tasks.celery_app",
+        "worker",
+        "--loglevel=info",
+        "--queues=scans",
+        "--hostname=cybersec-worker@%h",
+        "--concurrency=4",
+        # Hand each task to a child process that is free, so a long
+        # scan never holds up tasks queued behind it
+        "-Ofair",
+        # The prefetch multiplier comes from the app configuration
+        # (CELERY_PREFETCH_MULTIPLIER)
+    ]
+
+
 def main():
     """Start the Celery worker."""
+    logger.info("Starting Celery worker for CyberSec-CLI")
+
+    # Replace this process with the Celery CLI: the worker then receives
+    # supervisor signals directly, with no launcher process in between
+    argv = worker_argv()
     try:
-        # Import the Celery app
-        from tasks.celery_app import celery_app
-
-        logger.info("Starting Celery worker for CyberSec-CLI")
-
-        # Start the worker
-        celery_app.worker_main(
-            [
-                "worker",
-                "--loglevel=info",
-                "--queues=scans",
-                "--hostname=cybersec-worker@%h",
-                "--concurrency=4",
-                "--prefetch-multiplier=1",
-            ]
-        )
-
-    except KeyboardInterrupt:
-        logger.info("Worker stopped by user")
-    except Exception as e:
+        os.execv(argv[0], argv)
+    except OSError as e:
         logger.error(f"Worker failed to start: {e}")
         sys.exit(1)
 
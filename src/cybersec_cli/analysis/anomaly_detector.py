@@ -3,13 +3,19 @@ Anomaly Detection Module for CyberSec CLI.
 Implements various anomaly detection techniques for security monitoring.
 """
 
+import ipaddress
 import logging
 import os
+import tempfile
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from itertools import islice
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -21,6 +27,11 @@ from sklearn.ensemble import IsolationForest
 # Constants
 MODEL_SAVE_PATH = Path.home() / ".cybersec" / "models"
 MODEL_SAVE_PATH.mkdir(parents=True, exist_ok=True)
+# Metric samples kept for baselines and model training
+METRICS_HISTORY_SIZE = 1000
+# IsolationForest converts its input to float32 before fitting or scoring,
+# so features are kept in that type from the start
+FEATURE_DTYPE = np.float32
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +53,39 @@ class Protocol(Enum):
     UNKNOWN = auto()
 
 
+# Protocol usually spoken on well-known ports, for a single lookup per
+# connection. Ports listed for both TCP and UDP (DNS) count as TCP.
+_PORT_PROTOCOLS: Dict[int, Protocol] = {
+    **dict.fromkeys(
+        (53, 67, 68, 69, 123, 161, 162, 500, 1701, 1812, 1813, 4500), Protocol.UDP
+    ),
+    **dict.fromkeys(
+        (
+            20,
+            21,
+            22,
+            23,
+            25,
+            53,
+            80,
+            110,
+            143,
+            443,
+            587,
+            993,
+            995,
+            3306,
+            3389,
+            5432,
+            8080,
+            8443,
+        ),
+        Protocol.TCP,
+    ),
+    1: Protocol.ICMP,
+}
+
+
 @dataclass
 class Anomaly:
     """Represents a detected anomaly."""
@@ -71,6 +115,8 @@ class NetworkConnection:
     last_activity: float = field(default_factory=time.time)
     bytes_sent: int = 0
     bytes_recv: int = 0
+    # Poll in which the connection was last reported, to drop closed ones
+    last_tick: int = 0
 
     @property
     def duration(self) -> float:
@@ -78,12 +124,26 @@ class NetworkConnection:
         return time.time() - self.first_seen
 
 
+def _compile_feature_getter(names: List[str]):
+    """
+    Build a function returning the named values of a metrics dict as a tuple,
+    with 0 for missing ones. The generated code reads each key directly
+    instead of looping over the names on every call.
+    """
+    values = "".join(f"metrics.get({name!r}, 0), " for name in names)
+    namespace = {}
+    exec(f"def feature_values(metrics):\n    return ({values})\n", namespace)
+    return namespace["feature_values"]
+
+
 class MLAnomalyDetector:
     """Machine Learning based anomaly detector."""
 
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, n_jobs: int = None):
         self.model = None
         self.scaler = None
+        # Threads for scoring large batches; None scores in the calling thread
+        self.n_jobs = n_jobs
         self.feature_names = [
             "bytes_sent",
             "bytes_recv",
@@ -95,6 +155,7 @@ class MLAnomalyDetector:
             "drop_out",
             "connections",
         ]
+        self.feature_values = _compile_feature_getter(self.feature_names)
         self.model_path = model_path or str(
             MODEL_SAVE_PATH / "anomaly_detection_model.joblib"
         )
@@ -104,32 +165,63 @@ class MLAnomalyDetector:
         """Preprocess metrics for the ML model."""
         # Convert metrics to feature vector
         features = np.array(
-            [metrics.get(feature, 0) for feature in self.feature_names]
-        ).reshape(1, -1)
+            [self.feature_values(metrics)], dtype=FEATURE_DTYPE
+        )
         return features
 
     def detect(self, metrics: Dict[str, float]) -> Tuple[bool, float]:
         """Detect anomalies using the ML model."""
-        if self.model is None:
-            return False, 0.0
+        return self.detect_batch([metrics])[0]
 
-        features = self.preprocess(metrics)
-        is_anomaly = self.model.predict(features)[0] == -1
-        anomaly_score = float(self.model.score_samples(features)[0])
-        return is_anomaly, anomaly_score
+    def detect_batch(self, samples: List[Dict[str, float]]) -> List[Tuple[bool, float]]:
+        """Detect anomalies in several samples with one pass over the forest."""
+        # Read the model once: train() may replace it from another thread, and
+        # scores must be compared against the offset of the same forest
+        model = self.model
+        if model is None or not samples:
+            return [(False, 0.0)] * len(samples)
+
+        features = np.array(
+            [self.feature_values(metrics) for metrics in samples], dtype=FEATURE_DTYPE
+        )
+        # predict() is score_samples() compared against offset_, so score once
+        # rather than walking every tree twice
+        if self.n_jobs is None:
+            scores = model.score_samples(features)
+        else:
+            # Scoring only spreads the trees over workers from inside a joblib
+            # backend context; the model's own n_jobs applies to fit()
+            with joblib.parallel_backend("threading", n_jobs=self.n_jobs):
+                scores = model.score_samples(features)
+        is_anomaly = scores < model.offset_
+        return [(bool(a), float(s)) for a, s in zip(is_anomaly, scores)]
 
     def train(self, X: np.ndarray, contamination: float = 0.1):
         """Train the anomaly detection model."""
-        self.model = IsolationForest(
+        model = IsolationForest(
             n_estimators=100, contamination=contamination, random_state=42, n_jobs=-1
         )
-        self.model.fit(X)
+        model.fit(X)
+        # Replace the model only once it is fitted; detect() may be running
+        # in another thread
+        self.model = model
         self.save_model()
 
     def save_model(self):
         """Save the trained model to disk."""
         if self.model is not None:
-            joblib.dump(self.model, self.model_path)
+            # Write a temporary file and move it into place, so a save cut
+            # short (e.g. by exit during a background fit) or a concurrent
+            # load never sees a partial model
+            directory = os.path.dirname(self.model_path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                joblib.dump(self.model, tmp_path)
+                os.replace(tmp_path, self.model_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
 
     def load_model(self):
         """Load a trained model from disk."""
@@ -148,7 +240,20 @@ class AnomalyDetector:
         self.threshold = threshold
         self.baseline = None
         self.ml_detector = MLAnomalyDetector() if use_ml else None
-        self.metrics_history = []
+        # Oldest samples drop off the front in O(1) once the history is full
+        self.metrics_history = deque(maxlen=METRICS_HISTORY_SIZE)
+        # The same samples as ML feature rows, in a ring buffer, so training
+        # reads an array instead of converting the dicts
+        if self.ml_detector:
+            self._features = np.zeros(
+                (METRICS_HISTORY_SIZE, len(self.ml_detector.feature_names)),
+                dtype=FEATURE_DTYPE,
+            )
+            self._features_pos = 0
+            self._features_len = 0
+            # Training takes long enough to stall the detection loop, so the
+            # model is fitted in the background, one fit at a time
+            self._train_future = None
         self.connections: Dict[tuple, NetworkConnection] = {}
         self.port_activity = defaultdict(lambda: {"count": 0, "last_seen": 0})
         self.protocol_stats = defaultdict(lambda: {"count": 0, "bytes": 0})
@@ -158,49 +263,83 @@ class AnomalyDetector:
         if not data:
             return
 
+        # One conversion and one sort for all quantiles, instead of a pass
+        # over the list per statistic; the median is the 50th percentile
+        values = np.asarray(data, dtype=np.float64)
+        p25, p50, p75, p95, p99 = np.percentile(values, [25, 50, 75, 95, 99])
         self.baseline = {
-            "mean": np.mean(data),
-            "median": np.median(data),
-            "std": np.std(data) or 1.0,  # Avoid division by zero
-            "min": np.min(data),
-            "max": np.max(data),
+            "mean": values.mean(),
+            "median": p50,
+            "std": values.std() or 1.0,  # Avoid division by zero
+            "min": values.min(),
+            "max": values.max(),
             "percentiles": {
-                "25": np.percentile(data, 25),
-                "50": np.percentile(data, 50),
-                "75": np.percentile(data, 75),
-                "95": np.percentile(data, 95),
-                "99": np.percentile(data, 99),
+                "25": p25,
+                "50": p50,
+                "75": p75,
+                "95": p95,
+                "99": p99,
             },
         }
 
-        # Train ML model if enabled
-        if self.ml_detector and len(self.metrics_history) > 100:
-            try:
-                X = np.array(
-                    [
-                        [m.get(f, 0) for f in self.ml_detector.feature_names]
-                        for m in self.metrics_history[-1000:]  # Use recent data
-                    ]
-                )
-                self.ml_detector.train(X)
-            except Exception as e:
-                logger.error(f"Error training ML model: {e}")
+        # Train ML model if enabled, unless a previous fit is still running
+        if (
+            self.ml_detector
+            and len(self.metrics_history) > 100
+            and (self._train_future is None or self._train_future.done())
+        ):
+            self._train_future = Future()
+            # A daemon thread, so a fit still running does not delay exit
+            threading.Thread(
+                target=self._train_model,
+                args=(self._recent_features().copy(), self._train_future),
+                name="anomaly-train",
+                daemon=True,
+            ).start()
+
+    def _train_model(self, X: np.ndarray, future: Future) -> None:
+        """Fit the ML model on the given feature rows, then resolve future."""
+        try:
+            self.ml_detector.train(X)
+        except Exception as e:
+            logger.error(f"Error training ML model: {e}")
+        finally:
+            future.set_result(None)
+
+    def _record(self, metrics: Dict[str, float]) -> None:
+        """Add a sample to the metrics history."""
+        self.metrics_history.append(metrics)
+        if self.ml_detector:
+            self._features[self._features_pos] = self.ml_detector.feature_values(metrics)
+            self._features_pos = (self._features_pos + 1) % METRICS_HISTORY_SIZE
+            self._features_len = min(self._features_len + 1, METRICS_HISTORY_SIZE)
+
+    def _recent_features(self) -> np.ndarray:
+        """Feature rows of the recorded samples, oldest first."""
+        if self._features_len < METRICS_HISTORY_SIZE:
+            return self._features[: self._features_len]
+        return np.concatenate(
+            (self._features[self._features_pos :], self._features[: self._features_pos])
+        )
 
     def detect(self, metrics: Dict[str, float]) -> List[Anomaly]:
         """Detect anomalies in the given metrics."""
         anomalies = []
 
         # Store metrics for ML analysis
-        self.metrics_history.append(metrics)
-
-        # Rule-based detection
-        for metric, value in metrics.items():
-            if self.baseline and metric in self.baseline.get("percentiles", {}):
-                p99 = self.baseline["percentiles"].get("99", 0)
-                if value > p99 * 2:  # Value exceeds 2x 99th percentile
-                    score = (value - self.baseline["mean"]) / (
-                        self.baseline["std"] or 1.0
-                    )
+        self._record(metrics)
+
+        # Rule-based detection; the baseline figures are the same for every
+        # metric, so they are looked up once
+        if self.baseline:
+            percentiles = self.baseline["percentiles"]
+            p99 = percentiles["99"]
+            limit = p99 * 2  # Value exceeds 2x 99th percentile
+            mean = self.baseline["mean"]
+            std = self.baseline["std"] or 1.0
+            for metric, value in metrics.items():
+                if metric in percentiles and value > limit:
+                    score = (value - mean) / std
                     if score > self.threshold:
                         anomalies.append(
                             Anomaly(
@@ -251,6 +390,31 @@ class NetworkMetrics:
     connections: int = 0
 
 
+_LOOPBACK_HOSTS = frozenset(("127.0.0.1", "::1"))
+
+
+@lru_cache(maxsize=4096)
+def _is_private(host: str) -> bool:
+    """Whether host is a loopback, private-network or other non-public address."""
+    try:
+        return ipaddress.ip_address(host).is_private
+    except ValueError:
+        return False
+
+
+class _HostConnections:
+    """Connections to one remote host, aggregated for anomaly checks."""
+
+    __slots__ = ("count", "ports", "protocols", "first_seen", "last_seen")
+
+    def __init__(self):
+        self.count = 0
+        self.ports = set()
+        self.protocols = set()
+        self.first_seen = float("inf")
+        self.last_seen = 0
+
+
 class NetworkAnomalyDetector(AnomalyDetector):
     """Advanced network anomaly detector with protocol and connection analysis."""
 
@@ -265,6 +429,7 @@ class NetworkAnomalyDetector(AnomalyDetector):
             lambda: {"count": 0, "bytes": 0, "connections": set()}
         )
         self.host_activity = defaultdict(lambda: {"connections": 0, "bytes": 0})
+        self._tick = 0
         self.last_metrics = self._get_network_metrics()
         self.last_check = time.time()
         self.suspicious_ports = {
@@ -292,9 +457,14 @@ class NetworkAnomalyDetector(AnomalyDetector):
         else:
             io = net_io
 
-        # Get current connections
-        current_conns = {}
+        # Get current connections, stamping each with this poll's tick and
+        # counting it in the connection statistics as it is seen
+        self._tick += 1
+        tick = self._tick
         current_time = time.time()
+        by_status = defaultdict(int)
+        by_protocol = defaultdict(int)
+        by_port = defaultdict(int)
 
         for conn in psutil.net_connections(kind="inet"):
             try:
@@ -331,9 +501,8 @@ class NetworkAnomalyDetector(AnomalyDetector):
                             self.port_activity[port]["last_seen"] = current_time
 
                             # Track protocol stats
-                            proto = self._get_protocol(port)
-                            self.protocol_stats[proto]["count"] += 1
-                            self.protocol_stats[proto]["connections"].add(key)
+                            self.protocol_stats[conn_protocol]["count"] += 1
+                            self.protocol_stats[conn_protocol]["connections"].add(key)
 
                             # Track host activity
                             self.host_activity[conn.raddr[0]]["connections"] += 1
@@ -341,7 +510,12 @@ class NetworkAnomalyDetector(AnomalyDetector):
                     conn_obj = self.connections[key]
                     conn_obj.last_activity = current_time
                     conn_obj.status = conn.status
-                    current_conns[key] = conn_obj
+                    if conn_obj.last_tick != tick:  # Count each connection once
+                        conn_obj.last_tick = tick
+                        by_status[conn.status] += 1
+                        if len(conn.raddr) > 1:
+                            by_port[conn.raddr[1]] += 1
+                            by_protocol[conn_obj.protocol] += 1
 
             except (
                 psutil.NoSuchProcess,
@@ -351,27 +525,20 @@ class NetworkAnomalyDetector(AnomalyDetector):
                 logger.debug(f"Error processing connection: {e}")
                 continue
 
-        # Remove stale connections
-        stale_conns = set(self.connections.keys()) - set(current_conns.keys())
+        # Remove connections that were not reported in this poll
+        stale_conns = [
+            key for key, conn in self.connections.items() if conn.last_tick != tick
+        ]
         for key in stale_conns:
             del self.connections[key]
 
-        # Calculate connection statistics
         conn_stats = {
-            "total": len(current_conns),
-            "by_status": defaultdict(int),
-            "by_protocol": defaultdict(int),
-            "by_port": defaultdict(int),
+            "total": len(self.connections),
+            "by_status": by_status,
+            "by_protocol": by_protocol,
+            "by_port": by_port,
         }
 
-        for conn in current_conns.values():
-            conn_stats["by_status"][conn.status] += 1
-            if conn.raddr and len(conn.raddr) > 1:
-                port = conn.raddr[1]
-                conn_stats["by_port"][port] += 1
-                proto = self._get_protocol(port)
-                conn_stats["by_protocol"][proto] += 1
-
         # Update metrics
         metrics = NetworkMetrics(
             bytes_sent=io.bytes_sent,
@@ -382,7 +549,7 @@ class NetworkAnomalyDetector(AnomalyDetector):
             error_out=io.errout,
             drop_in=io.dropin,
             drop_out=io.dropout,
-            connections=len(current_conns),
+            connections=len(self.connections),
         )
 
         # Add connection stats to metrics
@@ -392,63 +559,29 @@ class NetworkAnomalyDetector(AnomalyDetector):
 
     def _get_protocol(self, port: int) -> Protocol:
         """Get protocol type based on port number."""
-        if port in {
-            20,
-            21,
-            22,
-            23,
-            25,
-            53,
-            80,
-            110,
-            143,
-            443,
-            587,
-            993,
-            995,
-            3306,
-            3389,
-            5432,
-            8080,
-            8443,
-        }:
-            return Protocol.TCP
-        elif port in {53, 67, 68, 69, 123, 161, 162, 500, 1701, 1812, 1813, 4500}:
-            return Protocol.UDP
-        elif port == 1:
-            return Protocol.ICMP
-        return Protocol.UNKNOWN
+        return _PORT_PROTOCOLS.get(port, Protocol.UNKNOWN)
 
     def _detect_port_scan(self) -> List[Anomaly]:
         """Detect potential port scanning activity with advanced heuristics."""
         anomalies = []
         current_time = time.time()
 
-        # Track scan patterns
+        # Group connections by remote IP; nothing is copied per connection
         scan_candidates = defaultdict(list)
-
-        # Analyze connection patterns
         for conn in self.connections.values():
-            if conn.raddr and conn.raddr[0] not in ["127.0.0.1", "::1"]:
-                scan_candidates[conn.raddr[0]].append(
-                    {
-                        "port": conn.raddr[1],
-                        "time": current_time,
-                        "protocol": conn.protocol.name,
-                    }
-                )
+            if conn.raddr and conn.raddr[0] not in _LOOPBACK_HOSTS:
+                scan_candidates[conn.raddr[0]].append(conn)
 
         # Check for horizontal and vertical scans
         for ip, connections in scan_candidates.items():
             if len(connections) > 5:  # Threshold for scan detection
                 # Get unique ports and protocols
-                unique_ports = len({c["port"] for c in connections})
-                protocols = {c["protocol"] for c in connections}
+                unique_ports = len({c.raddr[1] for c in connections})
+                protocols = {c.protocol.name for c in connections}
 
-                # Calculate connections per second
-                time_window = max(c["time"] for c in connections) - min(
-                    c["time"] for c in connections
-                )
+                # Calculate connections per second. All candidates are seen in
+                # the same poll, so there is no time window to spread them over
+                time_window = 0.0
                 cps = len(connections) / (time_window or 1)
 
                 if unique_ports > 3:  # Likely a port scan
@@ -515,16 +648,8 @@ class NetworkAnomalyDetector(AnomalyDetector):
         """Detect anomalies in connection patterns with advanced analysis."""
         anomalies = []
 
-        # Group connections by remote address and local port
-        connections_by_host = defaultdict(
-            lambda: {
-                "connections": [],
-                "ports": set(),
-                "protocols": set(),
-                "first_seen": float("inf"),
-                "last_seen": 0,
-            }
-        )
+        # Group connections by remote address
+        connections_by_host: Dict[str, _HostConnections] = {}
 
         # Analyze connection patterns
         for conn in self.connections.values():
@@ -534,24 +659,26 @@ class NetworkAnomalyDetector(AnomalyDetector):
             host = conn.raddr[0]
             port = conn.raddr[1] if len(conn.raddr) > 1 else None
 
-            host_data = connections_by_host[host]
-            host_data["connections"].append(conn)
+            host_data = connections_by_host.get(host)
+            if host_data is None:
+                host_data = connections_by_host[host] = _HostConnections()
+            host_data.count += 1
             if port:
-                host_data["ports"].add(port)
-            host_data["protocols"].add(conn.protocol.name)
-            host_data["first_seen"] = min(host_data["first_seen"], conn.first_seen)
-            host_data["last_seen"] = max(host_data["last_seen"], conn.last_activity)
+                host_data.ports.add(port)
+            host_data.protocols.add(conn.protocol.name)
+            if conn.first_seen < host_data.first_seen:
+                host_data.first_seen = conn.first_seen
+            if conn.last_activity > host_data.last_seen:
+                host_data.last_seen = conn.last_activity
 
         # Check each host for suspicious patterns
         for host, data in connections_by_host.items():
-            conn_count = len(data["connections"])
-            port_count = len(data["ports"])
-            time_window = data["last_seen"] - data["first_seen"]
+            conn_count = data.count
+            port_count = len(data.ports)
+            time_window = data.last_seen - data.first_seen
 
             # Skip localhost and private IPs for some checks
-            is_private = (
-                host.startswith(("127.", "10.", "192.168.", "172.16.")) or host == "::1"
-            )
+            is_private = _is_private(host)
 
             # 1. Multiple connections to the same host
             if conn_count > 10:  # High number of connections
@@ -566,7 +693,7 @@ class NetworkAnomalyDetector(AnomalyDetector):
                             "host": host,
                             "connections": conn_count,
                             "unique_ports": port_count,
-                            "protocols": list(data["protocols"]),
+                            "protocols": list(data.protocols),
                             "duration": time_window,
                             "connections_per_second": conn_count / (time_window or 1),
                         },
@@ -588,22 +715,22 @@ class NetworkAnomalyDetector(AnomalyDetector):
                             "connections": conn_count,
                             "duration": time_window,
                             "rate": conn_count / time_window,
-                            "ports": list(data["ports"])[:10],  # First 10 ports
+                            "ports": list(data.ports)[:10],  # First 10 ports
                         },
                     )
                 )
 
             # 3. Multiple protocols to same host (potential C2 traffic)
-            if len(data["protocols"]) > 2:  # Using multiple protocols
+            if len(data.protocols) > 2:  # Using multiple protocols
                 anomalies.append(
                     Anomaly(
                         anomaly_type=AnomalyType.SECURITY_ALERT,
                         timestamp=datetime.now(),
                         score=7.5,
-                        description=f"Multiple protocols to {host}: {', '.join(data['protocols'])}",
+                        description=f"Multiple protocols to {host}: {', '.join(data.protocols)}",
                         metadata={
                             "host": host,
-                            "protocols": list(data["protocols"]),
+                            "protocols": list(data.protocols),
                             "connections": conn_count,
                         },
                     )
@@ -611,7 +738,7 @@ class NetworkAnomalyDetector(AnomalyDetector):
 
             # 4. Suspicious port combinations (e.g., 22, 23, 80, 443 from same host)
             suspicious_ports = {22, 23, 80, 443, 445, 3389, 8080, 8443}
-            matched_ports = data["ports"] & suspicious_ports
+            matched_ports = data.ports & suspicious_ports
             if len(matched_ports) >= 2:  # At least 2 suspicious ports
                 anomalies.append(
                     Anomaly(
@@ -697,11 +824,7 @@ class NetworkAnomalyDetector(AnomalyDetector):
         # Update state
         self.last_metrics = current_metrics
         self.last_check = current_time
-        self.metrics_history.append(rates)
-
-        # Keep only last 1000 samples
-        if len(self.metrics_history) > 1000:
-            self.metrics_history.pop(0)
+        self._record(rates)
 
         # Detect anomalies
         anomalies = []
@@ -758,63 +881,60 @@ class NetworkAnomalyDetector(AnomalyDetector):
 
         anomalies = []
 
-        # Check each metric for anomalies
-        for metric, value in current_rates.items():
+        # Z-scores of every metric at once, against the earlier samples as
+        # columns of one array (the current sample is the newest in history)
+        metrics = list(current_rates)
+        history = np.array(
+            [
+                [m[metric] for metric in metrics]
+                for m in islice(self.metrics_history, len(self.metrics_history) - 1)
+            ],
+            dtype=np.float64,
+        )
+        values = np.array([current_rates[metric] for metric in metrics], dtype=np.float64)
+        means = history.mean(axis=0)
+        stds = history.std(axis=0)
+        stds[stds == 0] = 1.0
+        z_scores = np.abs((values - means) / stds)
+
+        flagged = {metrics[i]: i for i in np.flatnonzero(z_scores > self.threshold)}
+        for metric, i in flagged.items():
             if metric == "connections":
                 continue  # Handle connections separately
 
-            # Get historical values for this metric
-            history = [m[metric] for m in self.metrics_history[:-1]]  # Exclude current
-
-            if not history:
-                continue
-
-            # Simple z-score based anomaly detection
-            mean = sum(history) / len(history)
-            std = (sum((x - mean) ** 2 for x in history) / len(history)) ** 0.5 or 1.0
-            z_score = abs((value - mean) / std) if std != 0 else 0
-
-            if z_score > self.threshold:
-                anomalies.append(
-                    Anomaly(
-                        anomaly_type=AnomalyType.NETWORK_TRAFFIC,
-                        timestamp=time.time(),
-                        score=z_score,
-                        description=f"Unusual {metric.replace('_', ' ')}: {value:.2f}/s (mean: {mean:.2f})",
-                        metadata={
-                            "metric": metric,
-                            "value": value,
-                            "mean": mean,
-                            "std": std,
-                            "z_score": z_score,
-                        },
-                    )
+            value = current_rates[metric]
+            anomalies.append(
+                Anomaly(
+                    anomaly_type=AnomalyType.NETWORK_TRAFFIC,
+                    timestamp=time.time(),
+                    score=float(z_scores[i]),
+                    description=f"Unusual {metric.replace('_', ' ')}: {value:.2f}/s (mean: {means[i]:.2f})",
+                    metadata={
+                        "metric": metric,
+                        "value": value,
+                        "mean": float(means[i]),
+                        "std": float(stds[i]),
+                        "z_score": float(z_scores[i]),
+                    },
                 )
+            )
 
         # Check for unusual number of connections
-        if "connections" in current_rates:
-            conn_history = [m["connections"] for m in self.metrics_history[:-1]]
-            if conn_history:
-                mean_conn = sum(conn_history) / len(conn_history)
-                std_conn = (
-                    sum((x - mean_conn) ** 2 for x in conn_history) / len(conn_history)
-                ) ** 0.5 or 1.0
-                z_score = abs((current_rates["connections"] - mean_conn) / std_conn)
-
-                if z_score > self.threshold:
-                    anomalies.append(
-                        Anomaly(
-                            anomaly_type=AnomalyType.NETWORK_TRAFFIC,
-                            timestamp=time.time(),
-                            score=z_score,
-                            description=f"Unusual number of connections: {current_rates['connections']} (mean: {mean_conn:.1f})",
-                            metadata={
-                                "connections": current_rates["connections"],
-                                "mean_connections": mean_conn,
-                                "z_score": z_score,
-                            },
-                        )
-                    )
+        if "connections" in flagged:
+            i = flagged["connections"]
+            anomalies.append(
+                Anomaly(
+                    anomaly_type=AnomalyType.NETWORK_TRAFFIC,
+                    timestamp=time.time(),
+                    score=float(z_scores[i]),
+                    description=f"Unusual number of connections: {current_rates['connections']} (mean: {means[i]:.1f})",
+                    metadata={
+                        "connections": current_rates["connections"],
+                        "mean_connections": float(means[i]),
+                        "z_score": float(z_scores[i]),
+                    },
+                )
+            )
 
         return anomalies
 
@@ -24,8 +24,10 @@ celery_app.conf.update(
     task_routes={
         "tasks.scan_tasks.perform_scan_task": {"queue": "scans"},
     },
-    # Worker configuration
-    worker_prefetch_multiplier=1,
+    # Worker configuration. Scans mostly wait on the network, so each worker
+    # process reserves two tasks to hide the broker round trip between them;
+    # use 1 when workers mostly run long scans.
+    worker_prefetch_multiplier=int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "2")),
     task_acks_late=True,
     # Result expiration (24 hours)
     result_expires=86400,
@@ -0,0 +1,301 @@
+"""
+Unit tests for the statistical and ML anomaly detectors.
+"""
+
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pytest
+
+from cybersec_cli.analysis import anomaly_detector
+from cybersec_cli.analysis.anomaly_detector import (
+    METRICS_HISTORY_SIZE,
+    AnomalyDetector,
+    MLAnomalyDetector,
+    NetworkAnomalyDetector,
+    Protocol,
+)
+
+
+def test_update_baseline_statistics():
+    data = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+    detector = AnomalyDetector(use_ml=False)
+
+    detector.update_baseline(data)
+
+    baseline = detector.baseline
+    assert baseline["mean"] == pytest.approx(np.mean(data))
+    assert baseline["median"] == pytest.approx(np.median(data))
+    assert baseline["std"] == pytest.approx(np.std(data))
+    assert (baseline["min"], baseline["max"]) == (1.0, 9.0)
+    for q in (25, 50, 75, 95, 99):
+        assert baseline["percentiles"][str(q)] == pytest.approx(np.percentile(data, q))
+
+
+def test_update_baseline_constant_data_has_unit_std():
+    detector = AnomalyDetector(use_ml=False)
+
+    detector.update_baseline([2, 2, 2])
+
+    assert detector.baseline["std"] == 1.0
+    detector.update_baseline([])
+    assert detector.baseline["mean"] == 2.0
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_ml_detect_batch_matches_predict(tmp_path, n_jobs):
+    rng = np.random.default_rng(0)
+    detector = MLAnomalyDetector(model_path=str(tmp_path / "model.joblib"), n_jobs=n_jobs)
+    detector.train(rng.normal(100, 10, size=(300, len(detector.feature_names))))
+    rows = np.vstack([
+        rng.normal(100, 10, size=(25, len(detector.feature_names))),
+        rng.normal(100, 60, size=(25, len(detector.feature_names))),
+    ])
+    samples = [dict(zip(detector.feature_names, row)) for row in rows]
+
+    results = detector.detect_batch(samples)
+
+    features = np.array([[m[f] for f in detector.feature_names] for m in samples])
+    assert [a for a, _ in results] == list(detector.model.predict(features) == -1)
+    assert [s for _, s in results] == pytest.approx(detector.model.score_samples(features))
+    assert any(a for a, _ in results) and not all(a for a, _ in results)
+    assert detector.detect(samples[0]) == results[0]
+
+
+def test_ml_detect_without_model(tmp_path):
+    detector = MLAnomalyDetector(model_path=str(tmp_path / "missing.joblib"))
+
+    assert detector.detect({"bytes_sent": 1}) == (False, 0.0)
+    assert detector.detect_batch([{}, {}]) == [(False, 0.0), (False, 0.0)]
+
+
+def test_metrics_history_keeps_recent_samples():
+    detector = AnomalyDetector(use_ml=False)
+
+    for i in range(METRICS_HISTORY_SIZE + 5):
+        detector.detect({"value": float(i)})
+
+    assert len(detector.metrics_history) == METRICS_HISTORY_SIZE
+    assert detector.metrics_history[0] == {"value": 5.0}
+    assert detector.metrics_history[-1] == {"value": float(METRICS_HISTORY_SIZE + 4)}
+
+
+def test_training_features_follow_metrics_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(anomaly_detector, "MODEL_SAVE_PATH", tmp_path)
+    detector = AnomalyDetector()
+    names = detector.ml_detector.feature_names
+
+    for i in range(METRICS_HISTORY_SIZE + 7):
+        detector._record({"bytes_sent": float(i), "connections": i % 3, "other": 1.0})
+
+    expected = [[m.get(f, 0) for f in names] for m in detector.metrics_history]
+    np.testing.assert_array_equal(detector._recent_features(), expected)
+
+    detector.update_baseline([1.0, 2.0])
+    detector._train_future.result(timeout=30)
+    assert detector.ml_detector.model is not None
+    assert (tmp_path / "anomaly_detection_model.joblib").exists()
+
+
+def test_network_z_score_anomalies():
+    detector = NetworkAnomalyDetector(use_ml=False)
+    for i in range(20):
+        detector.metrics_history.append(
+            {"bytes_sent_rate": 100.0 + i % 2, "connections": 4, "drop_rate": 0.0}
+        )
+    current = {"bytes_sent_rate": 500.0, "connections": 40, "drop_rate": 0.0}
+    detector.metrics_history.append(current)
+
+    anomalies = detector._detect_anomalies(current)
+
+    assert [a.description for a in anomalies] == [
+        "Unusual bytes sent rate: 500.00/s (mean: 100.50)",
+        "Unusual number of connections: 40 (mean: 4.0)",
+    ]
+    assert anomalies[0].metadata["std"] == pytest.approx(0.5)
+    assert anomalies[0].score == pytest.approx(799.0)
+    assert anomalies[1].score == pytest.approx(36.0)  # Constant history: std 1
+
+
+@pytest.mark.parametrize(
+    "port, protocol",
+    [(22, Protocol.TCP), (53, Protocol.TCP), (123, Protocol.UDP), (1, Protocol.ICMP), (9999, Protocol.UNKNOWN)],
+)
+def test_protocol_from_port(port, protocol):
+    assert NetworkAnomalyDetector._get_protocol(None, port) is protocol
+
+
+_sconn = namedtuple("sconn", "fd family type laddr raddr status pid")
+
+
+def _conn(fd, ip, port, status="ESTABLISHED"):
+    return _sconn(fd, 2, 1, ("10.0.0.2", 40000 + fd), (ip, port), status, None)
+
+
+@pytest.fixture
+def net(monkeypatch):
+    """A NetworkAnomalyDetector reading connections from a settable list."""
+    reported = []
+    monkeypatch.setattr(anomaly_detector.psutil, "net_connections", lambda kind: reported)
+    detector = NetworkAnomalyDetector(use_ml=False)
+    return detector, reported
+
+
+def test_network_metrics_track_reported_connections(net):
+    detector, reported = net
+    reported[:] = [_conn(1, "1.2.3.4", 22), _conn(2, "1.2.3.4", 123, "TIME_WAIT")]
+    detector._get_network_metrics()
+    first_seen = detector.connections[(1, 2, 1, ("10.0.0.2", 40001), ("1.2.3.4", 22))].first_seen
+
+    reported[:] = [_conn(1, "1.2.3.4", 22), _conn(3, "5.6.7.8", 9999)]
+    metrics = detector._get_network_metrics()
+
+    assert sorted(key[0] for key in detector.connections) == [1, 3]
+    assert detector.connections[(1, 2, 1, ("10.0.0.2", 40001), ("1.2.3.4", 22))].first_seen == first_seen
+    assert metrics.connections == 2
+    stats = metrics.connection_stats
+    assert stats["total"] == 2
+    assert dict(stats["by_status"]) == {"ESTABLISHED": 2}
+    assert dict(stats["by_port"]) == {22: 1, 9999: 1}
+    assert dict(stats["by_protocol"]) == {Protocol.TCP: 1, Protocol.UNKNOWN: 1}
+    assert detector.port_activity[22]["count"] == 1
+
+
+def test_saved_model_survives_retraining(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    rng = np.random.default_rng(1)
+    trained = MLAnomalyDetector(model_path=path)
+    trained.train(rng.normal(size=(200, len(trained.feature_names))))
+    samples = [dict(zip(trained.feature_names, row)) for row in rng.normal(size=(5, 9))]
+
+    loaded = MLAnomalyDetector(model_path=path)
+    expected = trained.detect_batch(samples)
+    assert loaded.detect_batch(samples) == expected
+
+    # Another detector saving to the same path leaves the loaded model intact
+    trained.train(rng.normal(size=(200, len(trained.feature_names))))
+    assert loaded.detect_batch(samples) == expected
+
+
+def test_training_runs_in_background_one_fit_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(anomaly_detector, "MODEL_SAVE_PATH", tmp_path)
+    detector = AnomalyDetector()
+    for i in range(150):
+        detector._record({"bytes_sent": float(i)})
+    release = threading.Event()
+    fits = []
+
+    def train(X):
+        fits.append(X)
+        release.wait(timeout=30)
+
+    monkeypatch.setattr(detector.ml_detector, "train", train)
+
+    detector.update_baseline([1.0])
+    first = detector._train_future
+    detector.update_baseline([1.0])  # Returns while the first fit is running
+
+    assert detector._train_future is first
+    release.set()
+    first.result(timeout=30)
+    assert len(fits) == 1 and fits[0].shape == (150, len(detector.ml_detector.feature_names))
+
+
+def test_port_scan_detected_per_remote_ip(net):
+    detector, reported = net
+    reported[:] = [_conn(fd, "203.0.113.9", 1000 + fd) for fd in range(1, 8)]
+    reported += [_conn(fd, "127.0.0.1", 2000 + fd) for fd in range(10, 20)]
+    detector._get_network_metrics()
+
+    scans = [
+        a for a in detector._detect_port_scan() if a.description.startswith("Port scan")
+    ]
+
+    assert [a.description for a in scans] == [
+        "Port scan detected from 203.0.113.9: 7 ports in 0.0s"
+    ]
+    assert scans[0].metadata == {
+        "source_ip": "203.0.113.9",
+        "ports_scanned": 7,
+        "protocols": ["UNKNOWN"],
+        "connections_per_second": 7.0,
+        "total_connections": 7,
+    }
+    assert scans[0].score == pytest.approx(9.1)
+
+
+def test_connection_anomalies_per_host(net):
+    detector, reported = net
+    reported[:] = [_conn(fd, "198.51.100.7", 22 if fd % 2 else 80) for fd in range(1, 12)]
+    reported.append(_conn(20, "198.51.100.8", 443))
+    detector._get_network_metrics()
+
+    anomalies = detector._detect_connection_anomalies()
+
+    assert [a.description for a in anomalies] == [
+        "Multiple connections to 198.51.100.7: 11 active connections",
+        "Suspicious port access to 198.51.100.7: 80, 22",
+    ]
+    assert anomalies[0].metadata["unique_ports"] == 2
+    assert anomalies[0].metadata["protocols"] == ["TCP"]
+    assert anomalies[0].metadata["duration"] == 0
+
+
+def test_rule_based_detection_against_baseline():
+    detector = AnomalyDetector(use_ml=False)
+    detector.update_baseline([10.0, 11.0, 12.0, 13.0])
+
+    anomalies = detector.detect({"99": 100.0, "50": 20.0, "bytes_sent": 1000.0})
+
+    assert [a.description for a in anomalies] == ["Unusually high 99: 100.00 (99th: 12.97)"]
+    assert anomalies[0].score == pytest.approx((100.0 - 11.5) / np.std([10, 11, 12, 13]))
+    assert detector.detect({"99": 25.0}) == []
+
+
+@pytest.mark.parametrize(
+    "host, private",
+    [
+        ("127.0.0.1", True),
+        ("10.1.2.3", True),
+        ("172.16.0.1", True),
+        ("172.31.255.1", True),
+        ("192.168.1.1", True),
+        ("::1", True),
+        ("fd00::1", True),
+        ("172.32.0.1", False),
+        ("8.8.8.8", False),
+        ("2001:4860:4860::8888", False),
+        ("not-an-ip", False),
+    ],
+)
+def test_is_private(host, private):
+    assert anomaly_detector._is_private(host) is private
+
+
+def test_preprocess_reads_features_in_order(tmp_path):
+    detector = MLAnomalyDetector(model_path=str(tmp_path / "missing.joblib"))
+
+    features = detector.preprocess({"connections": 7, "bytes_sent": 1.5, "other": 9})
+
+    assert features.shape == (1, len(detector.feature_names))
+    assert features.dtype == np.float32
+    assert features[0].tolist() == [1.5, 0, 0, 0, 0, 0, 0, 0, 7]
+    assert anomaly_detector._compile_feature_getter([])({"a": 1}) == ()
+
+
+def test_detect_batch_uses_one_model_throughout(tmp_path):
+    detector = MLAnomalyDetector(model_path=str(tmp_path / "missing.joblib"))
+
+    class Model:
+        def __init__(self, offset):
+            self.offset_ = offset
+
+        def score_samples(self, X):
+            # A background fit replaces the model while this one is scoring
+            detector.model = Model(offset=-10.0)
+            return np.full(len(X), -0.6)
+
+    detector.model = Model(offset=-0.5)
+
+    assert detector.detect({}) == (True, -0.6)
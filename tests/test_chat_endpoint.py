@@ -0,0 +1,165 @@
+"""
+Tests for the /api/chat proxy to the Groq API, against a local fake server.
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _FakeGroq(BaseHTTPRequestHandler):
+    status = 200
+    body = b""
+    encoding = None
+    requests = []
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        type(self).requests.append((dict(self.headers), json.loads(self.rfile.read(length))))
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        if self.encoding:
+            self.send_header("Content-Encoding", self.encoding)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def groq(monkeypatch, tmp_path):
+    # Importing the app sets up file logging under ./logs; keep it out of the tree
+    monkeypatch.chdir(tmp_path)
+    import web.main as main
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGroq)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _FakeGroq.requests = []
+    _FakeGroq.encoding = None
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.delenv("GROQ_MODEL", raising=False)
+    monkeypatch.setattr(main, "GROQ_CHAT_URL", f"http://127.0.0.1:{server.server_port}/")
+    # Token counting may download tokenizer data; these tests only cover the proxying
+    monkeypatch.setattr(
+        main,
+        "_validate_messages_token_count",
+        lambda messages, model: {"valid": True, "total_tokens": 1, "limit": 8192, "error": None},
+    )
+    try:
+        yield main
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _reply(status, payload):
+    _FakeGroq.status = status
+    _FakeGroq.body = json.dumps(payload).encode()
+
+
+def _chat(main):
+    """Call the endpoint; return (status code, JSON body)."""
+    request = main.ChatRequest(messages=[{"role": "user", "content": "hi"}])
+
+    async def call():
+        try:
+            return await main.chat_endpoint(request, current_user="user")
+        finally:
+            await main.close_groq_session()
+
+    response = asyncio.run(call())
+    if isinstance(response, dict):
+        return 200, response
+    return response.status_code, json.loads(response.body)
+
+
+def test_chat_returns_model_reply(groq):
+    _reply(200, {"choices": [{"message": {"content": "hello"}}]})
+
+    assert _chat(groq) == (200, {"content": "hello"})
+
+    headers, payload = _FakeGroq.requests[-1]
+    assert headers["Authorization"] == "Bearer test-key"
+    assert headers["Content-Type"] == "application/json"
+    assert payload["messages"][-1] == {"role": "user", "content": "hi"}
+    assert payload["model"] == "llama-3.1-8b-instant"
+    assert (payload["temperature"], payload["max_tokens"]) == (0.5, 1024)
+
+
+def test_chat_accepts_gzip_replies(groq):
+    _FakeGroq.status = 200
+    _FakeGroq.encoding = "gzip"
+    _FakeGroq.body = gzip.compress(
+        json.dumps({"choices": [{"message": {"content": "hello"}}]}).encode()
+    )
+
+    assert _chat(groq) == (200, {"content": "hello"})
+    assert "gzip" in _FakeGroq.requests[-1][0]["Accept-Encoding"]
+
+
+def test_chat_maps_context_errors(groq):
+    _reply(400, {"error": {"message": "Please reduce the length: context too long"}})
+
+    assert _chat(groq) == (
+        400, {"detail": "AI context window exceeded. Try scanning fewer ports."}
+    )
+
+
+def test_chat_passes_through_provider_errors(groq):
+    _reply(429, {"error": {"message": "Rate limit reached"}})
+
+    assert _chat(groq) == (429, {"detail": "Rate limit reached"})
+
+
+@pytest.mark.parametrize("status", [401, 403])
+def test_chat_hides_provider_auth_errors(groq, status, caplog):
+    _reply(status, {"error": {"message": "Invalid API Key"}})
+
+    assert _chat(groq) == (502, {"detail": "AI provider rejected the request"})
+    assert "Invalid API Key" in caplog.text
+
+
+def test_chat_reports_unreachable_provider(groq, monkeypatch):
+    monkeypatch.setattr(groq, "GROQ_CHAT_URL", "http://127.0.0.1:1/")
+
+    assert _chat(groq) == (502, {"detail": "AI provider unreachable"})
+
+
+def _chat_stream(main):
+    """Call the streaming endpoint; return the decoded SSE events."""
+    request = main.ChatRequest(messages=[{"role": "user", "content": "hi"}])
+
+    async def call():
+        try:
+            response = await main.chat_stream_endpoint(request, current_user="user")
+            return [chunk async for chunk in response.body_iterator]
+        finally:
+            await main.close_groq_session()
+
+    return [json.loads(chunk[len("data: "):]) for chunk in asyncio.run(call())]
+
+
+def test_chat_stream_relays_deltas(groq):
+    chunks = [{"choices": [{"delta": {"role": "assistant"}}]}]
+    chunks += [{"choices": [{"delta": {"content": part}}]} for part in ("Hel", "lo")]
+    _FakeGroq.status = 200
+    _FakeGroq.body = b"".join(
+        b"data: " + json.dumps(chunk).encode() + b"\n\n" for chunk in chunks
+    ) + b"data: [DONE]\n\n"
+
+    events = _chat_stream(groq)
+
+    assert events == [
+        {"type": "content", "content": "Hel"},
+        {"type": "content", "content": "lo"},
+        {"type": "done"},
+    ]
+    assert _FakeGroq.requests[-1][1]["stream"] is True
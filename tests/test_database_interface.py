@@ -0,0 +1,61 @@
+"""
+Tests for the SQLite fallback of the unified database interface.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database import DatabaseInterface, DatabaseType  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, tmp_path):
+    """A DatabaseInterface on the SQLite fallback with canned scans."""
+    monkeypatch.chdir(tmp_path)
+    import web.main as main
+
+    scans = [
+        {"id": 2, "timestamp": "2024-01-02T00:00:00.000000+00:00", "target": "b.example"},
+        {"id": 1, "timestamp": "2024-01-01T00:00:00", "target": "a.example"},
+    ]
+    monkeypatch.setattr(main, "list_scans", lambda limit=50, user_id=None: scans[:limit])
+    db = DatabaseInterface()
+    db.db_type = DatabaseType.SQLITE
+    return db, main
+
+
+def test_sqlite_list_user_scans_returns_epoch_timestamps(sqlite_db):
+    db, _ = sqlite_db
+
+    scans = asyncio.run(db.list_user_scans("user"))
+
+    assert [(s["id"], s["created_at"], s["completed_at"]) for s in scans] == [
+        ("2", 1704153600, 1704153600),
+        ("1", 1704067200, 1704067200),
+    ]
+
+
+def test_sqlite_list_user_scans_page_counts_all_scans(sqlite_db, monkeypatch):
+    db, main = sqlite_db
+    monkeypatch.setattr(main, "count_scans", lambda user_id=None: 2)
+
+    scans, total = asyncio.run(db.list_user_scans_page("user", limit=1, offset=1))
+
+    assert [s["id"] for s in scans] == ["1"]
+    assert total == 2
+
+
+def test_count_scans_reads_the_scans_table(sqlite_db, monkeypatch, tmp_path):
+    _, main = sqlite_db
+    monkeypatch.setattr(main, "SCANS_DB", str(tmp_path / "scans.db"))
+    main.init_db()
+    for user in ("alice", "alice", "bob"):
+        main.save_scan_result("example.com", None, "scan example.com", "out", user_id=user)
+
+    assert main.count_scans() == 3
+    assert main.count_scans("alice") == 2
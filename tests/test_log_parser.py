@@ -0,0 +1,352 @@
+"""
+Unit tests for the JSON log parser.
+"""
+
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from monitoring.log_parser import LogParser  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+
+
+def _entry(message, level="INFO", component="scanner", minutes_ago=0, **context):
+    """Build a log entry shaped like JsonFormatter output."""
+    timestamp = NOW - timedelta(minutes=minutes_ago)
+    return {
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00"),
+        "level": level,
+        "component": component,
+        "message": message,
+        "context": context,
+        "trace_id": "trace",
+    }
+
+
+def _write_log(path, entries, compress=False):
+    data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+    if compress:
+        with gzip.open(path, "wb") as f:
+            f.write(data)
+    else:
+        path.write_bytes(data)
+
+
+def test_parse_log_file_skips_blank_and_invalid_lines(tmp_path):
+    log_file = tmp_path / "scanner.log"
+    log_file.write_bytes(
+        json.dumps(_entry("first")).encode()
+        + b"\n\nnot json\n\xff\xfe\n"
+        + json.dumps(_entry("second")).encode()
+        + b"\n"
+    )
+
+    entries = list(LogParser(str(tmp_path)).parse_log_file(str(log_file)))
+
+    assert [e["message"] for e in entries] == ["first", "second"]
+
+
+def test_parse_log_file_reads_gzip(tmp_path):
+    log_file = tmp_path / "scanner.log.1.gz"
+    _write_log(log_file, [_entry("rotated")], compress=True)
+
+    entries = list(LogParser(str(tmp_path)).parse_log_file(str(log_file)))
+
+    assert [e["message"] for e in entries] == ["rotated"]
+
+
+def test_search_logs_filters(tmp_path):
+    _write_log(
+        tmp_path / "app.log",
+        [
+            _entry("scan started", component="scanner"),
+            _entry("scan failed", level="ERROR", component="scanner"),
+            _entry("request served", component="api"),
+            _entry("old scan failed", level="error", component="scanner", minutes_ago=600),
+        ],
+    )
+    parser = LogParser(str(tmp_path))
+
+    errors = parser.search_logs(component="scanner", level="error")
+    assert [e["message"] for e in errors] == ["scan failed", "old scan failed"]
+
+    recent = parser.search_logs(
+        start_time=NOW - timedelta(hours=1), end_time=NOW + timedelta(minutes=1)
+    )
+    assert len(recent) == 3
+
+    matched = parser.search_logs(message_pattern="^SCAN")
+    assert [e["message"] for e in matched] == ["scan started", "scan failed"]
+
+    assert len(parser.search_logs(limit=2)) == 2
+
+
+def test_get_scan_logs_includes_rotated_files(tmp_path):
+    _write_log(tmp_path / "scanner.log", [_entry("live", scan_id="abc")])
+    _write_log(
+        tmp_path / "scanner.log.1.gz",
+        [_entry("rotated", scan_id="abc"), _entry("other", scan_id="xyz")],
+        compress=True,
+    )
+
+    logs = LogParser(str(tmp_path)).get_scan_logs("abc")
+
+    assert sorted(e["message"] for e in logs) == ["live", "rotated"]
+
+
+
+def test_search_logs_skips_files_last_written_before_window(tmp_path):
+    log_file = tmp_path / "old.log"
+    _write_log(log_file, [_entry("stale")])
+    two_days_ago = (NOW - timedelta(days=2)).timestamp()
+    os.utime(log_file, (two_days_ago, two_days_ago))
+
+    parser = LogParser(str(tmp_path))
+
+    assert parser.search_logs(start_time=NOW - timedelta(hours=1)) == []
+    assert len(parser.search_logs()) == 1
+
+
+def test_search_logs_component_with_escaped_characters(tmp_path):
+    _write_log(tmp_path / "app.log", [_entry("hello", component="scänner")])
+
+    logs = LogParser(str(tmp_path)).search_logs(component="scänner")
+
+    assert [e["message"] for e in logs] == ["hello"]
+
+
+def test_search_logs_accepts_naive_time_window(tmp_path):
+    _write_log(tmp_path / "app.log", [_entry("recent"), _entry("old", minutes_ago=600)])
+
+    end_time = datetime.now()
+    logs = LogParser(str(tmp_path)).search_logs(
+        start_time=end_time - timedelta(hours=1), end_time=end_time + timedelta(minutes=1)
+    )
+
+    assert [e["message"] for e in logs] == ["recent"]
+
+
+def test_generate_report_counts(tmp_path):
+    _write_log(
+        tmp_path / "app.log",
+        [
+            _entry("a", level="INFO", component="scanner"),
+            _entry("b", level="ERROR", component="scanner"),
+            _entry("c", level="warning", component="api"),
+            _entry("d", level="DEBUG", component="api", minutes_ago=600),
+        ],
+    )
+
+    report = LogParser(str(tmp_path)).generate_report(
+        NOW - timedelta(hours=1), NOW + timedelta(minutes=1)
+    )
+
+    assert report["total_entries"] == 3
+    assert report["errors"] == 1
+    assert report["warnings"] == 1
+    assert report["info"] == 1
+    assert report["debug"] == 0
+    assert report["components"]["scanner"] == {
+        "total": 2,
+        "errors": 1,
+        "warnings": 0,
+        "info": 1,
+        "debug": 0,
+    }
+    assert report["components"]["api"]["warnings"] == 1
+
+
+def test_parallel_scan_matches_serial(tmp_path):
+    for name in ("scanner.log", "api.log", "web.log"):
+        _write_log(
+            tmp_path / name,
+            [
+                _entry(f"{name} info", component=name),
+                _entry(f"{name} error", level="ERROR", component=name),
+            ],
+        )
+    window = (NOW - timedelta(hours=1), NOW + timedelta(minutes=1))
+
+    serial = LogParser(str(tmp_path), max_workers=1)
+    parallel = LogParser(str(tmp_path), max_workers=2)
+
+    assert parallel.search_logs(level="ERROR") == serial.search_logs(level="ERROR")
+    assert len(parallel.search_logs(limit=4)) == 4
+    assert parallel.generate_report(*window) == serial.generate_report(*window)
+
+
+def test_get_scan_logs_index_follows_appends_and_rotation(tmp_path):
+    log_file = tmp_path / "scanner.log"
+    _write_log(log_file, [_entry("first", scan_id="abc")])
+    parser = LogParser(str(tmp_path))
+    assert [e["message"] for e in parser.get_scan_logs("abc")] == ["first"]
+    assert (tmp_path / "log_index.sqlite").exists()
+
+    with open(log_file, "a") as f:
+        f.write(json.dumps(_entry("second", scan_id="abc")) + "\n")
+        f.write('{"partial": ')
+    assert [e["message"] for e in parser.get_scan_logs("abc")] == ["first", "second"]
+
+    # Rotation replaces the live file with a new, shorter one
+    log_file.unlink()
+    _write_log(log_file, [_entry("new", scan_id="abc")])
+    assert [e["message"] for e in parser.get_scan_logs("abc")] == ["new"]
+
+
+def test_field_fast_path_falls_back_to_full_parse(tmp_path):
+    reordered = {"component": "scanner", "level": "ERROR", "message": "reordered"}
+    reordered["timestamp"] = _entry("x")["timestamp"]
+    (tmp_path / "app.log").write_text(
+        json.dumps(_entry("plain", level="ERROR")) + "\n"
+        + json.dumps(_entry("quoted", level="ERROR", component='scan"ner')) + "\n"
+        + json.dumps(reordered) + "\n"
+        + json.dumps(_entry("truncated", level="ERROR"))[:-1] + "\n"
+    )
+    parser = LogParser(str(tmp_path))
+
+    errors = parser.search_logs(level="ERROR")
+    assert [e["message"] for e in errors] == ["plain", "quoted", "reordered"]
+    assert [e["message"] for e in parser.search_logs(component='scan"ner')] == ["quoted"]
+
+    report = parser.generate_report(NOW - timedelta(hours=1), NOW + timedelta(minutes=1))
+    assert report["errors"] == 3
+    assert report["components"]["scanner"]["total"] == 2
+
+
+def test_parse_log_file_batched(tmp_path):
+    log_file = tmp_path / "app.log"
+    _write_log(log_file, [_entry(str(i)) for i in range(5)])
+
+    batches = list(LogParser(str(tmp_path)).parse_log_file_batched(str(log_file), batch=2))
+
+    assert [[e["message"] for e in b] for b in batches] == [["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_get_audit_events_filters_type_and_window(tmp_path):
+    audit_log = tmp_path / "audit.log"
+    _write_log(
+        audit_log,
+        [
+            _entry("login", event_type="login"),
+            _entry("logout", event_type="logout"),
+            _entry("old login", event_type="login", minutes_ago=48 * 60),
+        ],
+    )
+    parser = LogParser(str(tmp_path))
+
+    events = parser.get_audit_events(event_type="login", audit_log_path=audit_log)
+    assert [e["message"] for e in events] == ["login"]
+    assert len(parser.get_audit_events(audit_log_path=audit_log)) == 2
+
+
+def test_parse_log_file_fast_yields_records(tmp_path):
+    log_file = tmp_path / "app.log"
+    first = _entry("plain", level="ERROR", component="api")
+    second = _entry('say "hi"', scan_id="abc")
+    _write_log(log_file, [first, second])
+
+    records = list(LogParser(str(tmp_path)).parse_log_file_fast(str(log_file)))
+
+    assert records == [
+        (first["timestamp"], "ERROR", "api", "plain", None),
+        (second["timestamp"], "INFO", "scanner", 'say "hi"', "abc"),
+    ]
+
+
+def test_get_scan_logs_reads_only_files_with_the_scan(tmp_path, monkeypatch):
+    from monitoring.log_index import LogIndex
+
+    _write_log(tmp_path / "a.log", [_entry("hit", scan_id="abc")])
+    _write_log(tmp_path / "b.log", [_entry("miss", scan_id="xyz")])
+    _write_log(tmp_path / "c.log.1.gz", [_entry("none")], compress=True)
+    parser = LogParser(str(tmp_path))
+    parser.get_scan_logs("warm-up")
+
+    read = []
+    original = LogIndex.read_entries
+
+    def recording_read_entries(path, spans):
+        read.append(os.path.basename(path))
+        return original(path, spans)
+
+    monkeypatch.setattr(LogIndex, "read_entries", staticmethod(recording_read_entries))
+
+    assert [e["message"] for e in parser.get_scan_logs("abc")] == ["hit"]
+    assert read == ["a.log"]
+
+
+def test_find_log_files_walks_subdirectories(tmp_path):
+    (tmp_path / "api").mkdir()
+    _write_log(tmp_path / "api" / "api.log", [_entry("nested")])
+    _write_log(tmp_path / "scanner.log.2", [_entry("rotated")])
+    (tmp_path / "notes.txt").write_text("not a log")
+
+    files = LogParser(str(tmp_path))._get_log_files()
+
+    assert sorted(os.path.relpath(f, tmp_path) for f in files) == [
+        os.path.join("api", "api.log"),
+        "scanner.log.2",
+    ]
+
+
+def test_main_writes_json_lines(tmp_path, monkeypatch, capsysbinary):
+    from monitoring import log_parser
+
+    _write_log(tmp_path / "app.log", [_entry("one", scan_id="abc"), _entry("two", scan_id="abc")])
+    monkeypatch.setattr(
+        sys, "argv", ["log_parser", "--log-dir", str(tmp_path), "--scan-id", "abc"]
+    )
+
+    log_parser.main()
+
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert [json.loads(line)["message"] for line in lines] == ["one", "two"]
+
+
+def test_concurrent_index_updates_do_not_duplicate_entries(tmp_path):
+    import threading
+
+    from monitoring.log_index import LogIndex
+
+    log = tmp_path / "scanner.log"
+    _write_log(log, [_entry("one", scan_id="abc"), _entry("two", scan_id="abc")])
+    index_path = str(tmp_path / "index.db")
+    first_indexing = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def update(hold):
+        try:
+            with LogIndex(index_path) as index:
+                if hold:
+                    original = index._index_file
+
+                    def slow_index_file(path, start):
+                        first_indexing.set()
+                        release.wait(timeout=30)
+                        return original(path, start)
+
+                    index._index_file = slow_index_file
+                index.update([log])
+        except Exception as e:  # surfaced by the assertion below
+            errors.append(e)
+
+    first = threading.Thread(target=update, args=(True,))
+    first.start()
+    assert first_indexing.wait(timeout=30)
+    second = threading.Thread(target=update, args=(False,))
+    second.start()
+    second.join(timeout=0.2)  # Blocks on the first update's write lock
+    release.set()
+    first.join(timeout=30)
+    second.join(timeout=30)
+
+    assert errors == []
+    with LogIndex(index_path) as index:
+        assert len(index.find("abc")[str(log)]) == 2
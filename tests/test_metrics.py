@@ -0,0 +1,26 @@
+"""
+Unit tests for the Prometheus metrics collector.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from monitoring.metrics import REGISTRY, MetricsCollector, metrics_collector  # noqa: E402
+
+
+def test_collectors_share_the_metrics_registry():
+    assert MetricsCollector().registry is REGISTRY
+    assert metrics_collector.registry is REGISTRY
+
+
+def test_get_metrics_exports_recorded_values():
+    metrics_collector.increment_scan(status="completed", user_type="test")
+    metrics_collector.increment_rate_limit_violation("test")
+
+    payload = metrics_collector.get_metrics()
+
+    assert 'scans_total{status="completed",user_type="test"}' in payload
+    assert 'rate_limit_violations_total{violation_type="test"}' in payload
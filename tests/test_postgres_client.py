@@ -0,0 +1,125 @@
+"""
+Unit tests for PostgresClient connection setup, without a database server.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database import postgres_client  # noqa: E402
+from database.postgres_client import PostgresClient  # noqa: E402
+
+
+def test_connect_retries_after_unconfigured_attempt(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    client = PostgresClient()
+    attempts = []
+    results = iter([False, True])
+
+    async def initialize():
+        attempts.append(asyncio.get_running_loop())
+        return next(results)
+
+    monkeypatch.setattr(client, "initialize", initialize)
+
+    assert asyncio.run(client.connect()) is False
+    assert client._connect_tasks == {}
+    assert asyncio.run(client.connect()) is True
+    assert len(attempts) == 2
+
+
+def test_connect_shares_one_attempt_per_event_loop(monkeypatch):
+    client = PostgresClient()
+    calls = []
+
+    async def initialize():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return True
+
+    monkeypatch.setattr(client, "initialize", initialize)
+
+    async def connect_twice():
+        return await asyncio.gather(client.connect(), client.connect())
+
+    assert asyncio.run(connect_twice()) == [True, True]
+    assert len(calls) == 1
+    # A new event loop cannot await the first loop's task; it gets its own
+    assert asyncio.run(client.connect()) is True
+    assert len(calls) == 2
+
+
+class _FakePool:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return pool
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+    async def fetchval(self, query):
+        return 1
+
+    async def close(self):
+        self.closed = True
+
+
+def test_one_pool_per_event_loop(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/test")
+    monkeypatch.setattr(postgres_client, "_instance", None)
+    pools = []
+
+    async def create_pool(*args, **kwargs):
+        pools.append(_FakePool())
+        return pools[-1]
+
+    monkeypatch.setattr(postgres_client.asyncpg, "create_pool", create_pool)
+
+    async def get_pool():
+        client = await postgres_client.get_postgres_client()
+        return client.pool
+
+    loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+    try:
+        seen = [loops[i % 2].run_until_complete(get_pool()) for i in range(6)]
+
+        assert len(pools) == 2
+        assert [pool.loop for pool in seen] == [loops[i % 2] for i in range(6)]
+        assert PostgresClient().pool is None  # Outside of any event loop
+
+        for loop in loops:
+            loop.run_until_complete(postgres_client._instance.close())
+        assert all(pool.closed for pool in pools)
+    finally:
+        for loop in loops:
+            loop.close()
+
+
+def test_get_postgres_client_without_database_url(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(postgres_client, "_instance", None)
+    attempts = []
+
+    async def initialize(self):
+        attempts.append(1)
+        return False
+
+    monkeypatch.setattr(PostgresClient, "initialize", initialize)
+
+    async def get_twice():
+        await postgres_client.get_postgres_client()
+        return await postgres_client.get_postgres_client()
+
+    assert asyncio.run(get_twice()).enabled is False
+    assert attempts == []
@@ -0,0 +1,89 @@
+"""
+Unit tests for the simple interactive CLI.
+"""
+
+import io
+import os
+import shlex
+import sys
+
+import pytest
+
+# The CLI is a standalone script
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+)
+
+from simple_cli import MAX_INPUT_LEN, Command, main, process_command, split_words  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "",
+        "   ",
+        "scan example.com",
+        "scan\texample.com  -p 80",
+        'scan "my host" --name=\'a b\'',
+        'say "esc \\" \\\\ \\n" x\\ y',
+        "a'b'\"c\"d",
+        "'' \"\"",
+        "# not a comment",
+        "scan\x0bexample.com\xa0x",
+    ],
+)
+def test_split_words_matches_shlex(line):
+    assert split_words(line) == shlex.split(line)
+
+
+@pytest.mark.parametrize("line", ['scan "unclosed', "scan 'unclosed", "scan trailing\\"])
+def test_split_words_rejects_unbalanced_input(line):
+    with pytest.raises(ValueError):
+        split_words(line)
+
+
+def test_command_parse_lowercases_name():
+    cmd = Command.parse("  SCAN example.com 80 ")
+
+    assert cmd.name == "scan"
+    assert cmd.args == ["example.com", "80"]
+    assert Command.parse("").name == ""
+
+
+def test_process_command_dispatch(capsys):
+    assert process_command(Command.parse("scan example.com")) is True
+    assert "Scan completed for example.com" in capsys.readouterr().out
+    assert process_command(Command.parse("nope")) is True
+    assert "Unknown command: nope" in capsys.readouterr().out
+    assert process_command(Command.parse("")) is True
+    assert process_command(Command.parse("QUIT")) is False
+
+
+def test_main_stops_at_end_of_input(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("scan example.com\n"))
+
+    main()
+
+    out = capsys.readouterr().out
+    assert out.count("cybersec> ") == 2
+    assert "Scan completed for example.com" in out
+    assert out.endswith("Thank you for using Cybersec CLI!\n")
+
+
+def test_main_strips_bracketed_paste_markers(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\x1b[200~scan example.com\x1b[201~\n"))
+
+    main()
+
+    assert "Starting scan of: example.com\n" in capsys.readouterr().out
+
+
+def test_main_truncates_long_input(monkeypatch, capsys):
+    target = "x" * MAX_INPUT_LEN
+    monkeypatch.setattr(sys, "stdin", io.StringIO(f"scan {target}\n"))
+
+    main()
+
+    out = capsys.readouterr().out
+    assert f"[!] Input truncated to {MAX_INPUT_LEN} characters" in out
+    assert f"Starting scan of: {target[: MAX_INPUT_LEN - len('scan ')]}\n" in out
@@ -45,9 +45,20 @@ import uuid
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # optional
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from fastapi import Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Security
@@ -941,6 +952,21 @@ def list_scans(limit: int = 50, user_id: Optional[str] = None):
         return []
 
 
+def count_scans(user_id: Optional[str] = None) -> int:
+    """Count stored scans; filters by user_id when provided."""
+    try:
+        with sqlite3.connect(SCANS_DB) as conn:
+            c = conn.cursor()
+            if user_id:
+                c.execute("SELECT COUNT(*) FROM scans WHERE user_id = ?", (user_id,))
+            else:
+                c.execute("SELECT COUNT(*) FROM scans")
+            return c.fetchone()[0]
+    except Exception:
+        logger.exception("Failed to count scans")
+        return 0
+
+
 async def get_forced_scans():
     """Return the forced scan audit log as JSON list (read from reports/forced_scans.jsonl)."""
     reports_file = os.path.join(
@@ -1877,8 +1903,7 @@ def _prepare_chat_messages(request: ChatRequest) -> List[dict]:
         context = request.context.strip()
         # Intelligent context summarization
         from web.utils.context_summarizer import summarize_scan_context
-        model = os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant")
-        context = summarize_scan_context(context, model)
+        context = summarize_scan_context(context, _groq_model())
         messages.append({"role": "system", "content": f"Context:\n{context}"})
 
     history = request.messages[-MAX_HISTORY_MESSAGES:] if request.messages else []
@@ -1923,100 +1948,239 @@ def _validate_messages_token_count(messages: List[dict], model: str) -> dict:
     }
 
 
-@app.post("/api/chat", tags=["AI"], summary="AI Assistant Chat")
-async def chat_endpoint(request: ChatRequest, current_user: str = Depends(get_current_user)):
-    """Forward chat messages to Groq API after local validation."""
-    import requests
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_DEFAULT_MODEL = "llama-3.1-8b-instant"
+GROQ_TIMEOUT_SECONDS = 15
+# Concurrent connections kept to the Groq API, and how long idle ones stay
+# open for reuse by the next chat request
+GROQ_MAX_CONNECTIONS = 16
+GROQ_KEEPALIVE_SECONDS = 60
+
+
+def _groq_model() -> str:
+    """Model for chat requests; GROQ_MODEL overrides the default."""
+    return os.environ.get("GROQ_MODEL", GROQ_DEFAULT_MODEL)
+
+
+# Request body fields that are the same for every chat request, serialized
+# once as the closing part of the JSON object
+_GROQ_BODY_TAIL = b',"temperature":0.5,"max_tokens":1024}'
+_GROQ_STREAM_BODY_TAIL = b',"temperature":0.5,"max_tokens":1024,"stream":true}'
+
+
+def _groq_request_body(model: str, messages: List[dict], stream: bool = False) -> bytes:
+    """Serialize a chat completion request; only model and messages vary."""
+    return b"".join((
+        b'{"model":',
+        _dumps(model),
+        b',"messages":',
+        _dumps(messages),
+        _GROQ_STREAM_BODY_TAIL if stream else _GROQ_BODY_TAIL,
+    ))
+
+# Shared aiohttp session for Groq calls, so connections and TLS sessions are
+# reused between chat requests. Sessions are bound to the event loop that
+# created them, hence the loop is kept alongside.
+_groq_session = None
+_groq_session_loop = None
+
+
+def _get_groq_session():
+    """Return the shared Groq HTTP session, creating it on first use."""
+    import aiohttp
+
+    global _groq_session, _groq_session_loop
+    loop = asyncio.get_running_loop()
+    if _groq_session is None or _groq_session.closed or _groq_session_loop is not loop:
+        _groq_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=GROQ_MAX_CONNECTIONS,
+                keepalive_timeout=GROQ_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300,
+            ),
+            timeout=aiohttp.ClientTimeout(total=GROQ_TIMEOUT_SECONDS),
+            # aiohttp already keeps connections alive and sends
+            # Accept-Encoding: gzip, deflate, decompressing replies itself
+            headers={"Content-Type": "application/json"},
+        )
+        _groq_session_loop = loop
+    return _groq_session
+
+
+@app.on_event("shutdown")
+async def close_groq_session():
+    """Close the shared Groq HTTP session."""
+    global _groq_session
+    if _groq_session is not None and not _groq_session.closed:
+        await _groq_session.close()
+    _groq_session = None
+
+
+def _groq_error_response(status_code: int, body: str) -> JSONResponse:
+    """Turn an error response from Groq into the response for our client."""
     try:
-        # SECURITY: Groq API key must come from environment; never log or expose.
-        api_key = os.environ.get("GROQ_API_KEY")
-        if not api_key:
-            return JSONResponse(status_code=500, content={"detail": "GROQ_API_KEY environment variable not set. Please set it to use the AI assistant."})
+        error_body = json.loads(body)
+    except ValueError:
+        error_body = {}
+    if not isinstance(error_body, dict):
+        error_body = {}
+    error = error_body.get("error")
+    error_msg = (error.get("message") if isinstance(error, dict) else None) or ""
+
+    # Specific handling for context-too-large (400/413)
+    if status_code == 400 and ("context" in error_msg.lower() or "token" in error_msg.lower()):
+        return JSONResponse(
+            status_code=400,
+            content={"detail": "AI context window exceeded. Try scanning fewer ports."}
+        )
 
-        model = os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant")
-        messages = _prepare_chat_messages(request)
+    detail = error_msg or error_body.get("message") or body or "Failed to communicate with AI provider"
+    logger.error("Error in chat endpoint HTTP request: %s", detail)
 
-        # Pre-flight validation before hitting Groq API
-        validation = _validate_messages_token_count(messages, model)
+    # Our API key was rejected: a server-side problem, and the provider's
+    # message is not for the client
+    if status_code in (401, 403):
+        return JSONResponse(
+            status_code=502, content={"detail": "AI provider rejected the request"}
+        )
+    return JSONResponse(status_code=status_code, content={"detail": detail})
 
-        if not validation["valid"]:
-            logger.error(
-                f"[AI Context] Token validation failed: {validation['error']}"
-            )
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "detail": "Scan context is too large for AI analysis. "
-                              "Please use a smaller port range or summarize results first.",
-                    "token_info": {
-                        "total": validation["total_tokens"],
-                        "limit": validation["limit"],
-                        "model": model
-                    }
+
+def _groq_chat_preflight(request: ChatRequest):
+    """
+    Build and validate the messages for a chat request.
+
+    Returns (error response or None, api_key, model, messages).
+    """
+    # SECURITY: Groq API key must come from environment; never log or expose.
+    api_key = os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        return JSONResponse(status_code=500, content={"detail": "GROQ_API_KEY environment variable not set. Please set it to use the AI assistant."}), None, None, None
+
+    model = _groq_model()
+    messages = _prepare_chat_messages(request)
+
+    # Pre-flight validation before hitting Groq API
+    validation = _validate_messages_token_count(messages, model)
+
+    if not validation["valid"]:
+        logger.error(
+            f"[AI Context] Token validation failed: {validation['error']}"
+        )
+        return JSONResponse(
+            status_code=400,
+            content={
+                "detail": "Scan context is too large for AI analysis. "
+                          "Please use a smaller port range or summarize results first.",
+                "token_info": {
+                    "total": validation["total_tokens"],
+                    "limit": validation["limit"],
+                    "model": model
                 }
-            )
+            }
+        ), None, None, None
 
-        loop = asyncio.get_running_loop()
+    return None, api_key, model, messages
 
-        def make_request():
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": messages,
-                    "temperature": 0.5,
-                    "max_tokens": 1024
-                },
-                timeout=15
-            )
-            response.raise_for_status()
-            return response.json()
 
-        data = await loop.run_in_executor(None, make_request)
+@app.post("/api/chat", tags=["AI"], summary="AI Assistant Chat")
+async def chat_endpoint(request: ChatRequest, current_user: str = Depends(get_current_user)):
+    """Forward chat messages to Groq API after local validation."""
+    import aiohttp
+    try:
+        error, api_key, model, messages = _groq_chat_preflight(request)
+        if error is not None:
+            return error
+
+        async with _get_groq_session().post(
+            GROQ_CHAT_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            data=_groq_request_body(model, messages),
+        ) as response:
+            if response.status >= 400:
+                return _groq_error_response(response.status, await response.text())
+            data = _loads(await response.read())
         ai_message = data["choices"][0]["message"]["content"]
 
         return {"content": ai_message}
-    except requests.exceptions.HTTPError as e:
-        status_code = e.response.status_code if getattr(e, "response", None) else 502
-        detail = "Failed to communicate with AI provider"
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error("Error in chat endpoint HTTP request: %s", e)
+        return JSONResponse(status_code=502, content={"detail": "AI provider unreachable"})
+    except Exception as e:
+        logger.exception("Error in chat endpoint")
+        return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
-        # Specific handling for context-too-large (400/413)
-        if status_code == 400:
-            error_body = {}
-            try:
-                error_body = e.response.json()
-            except:
-                pass
-            error_msg = error_body.get("error", {}).get("message", "")
-            if "context" in error_msg.lower() or "token" in error_msg.lower():
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": "AI context window exceeded. Try scanning fewer ports."}
-                )
 
-        if getattr(e, "response", None):
+async def _iter_groq_deltas(response):
+    """
+    Yield the content deltas of a streamed Groq completion as they arrive,
+    parsing its server-sent events line by line.
+    """
+    async for line in response.content:
+        if not line.startswith(b"data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == b"[DONE]":
+            return
+        choices = _loads(payload).get("choices") or ({},)
+        content = (choices[0].get("delta") or {}).get("content")
+        if content:
+            yield content
+
+
+@app.post(
+    "/api/chat/stream",
+    tags=["AI"],
+    summary="AI Assistant Chat (streaming)",
+    description="Like /api/chat, but streams the reply as Server-Sent Events "
+                "(content events, then done) while Groq generates it.",
+)
+async def chat_stream_endpoint(request: ChatRequest, current_user: str = Depends(get_current_user)):
+    """Forward chat messages to Groq API and relay the reply as it is generated."""
+    import aiohttp
+    try:
+        error, api_key, model, messages = _groq_chat_preflight(request)
+        if error is not None:
+            return error
+
+        response = await _get_groq_session().post(
+            GROQ_CHAT_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            data=_groq_request_body(model, messages, stream=True),
+            # Long replies may stream for longer than a whole request may take;
+            # only bound the wait for each chunk
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=GROQ_TIMEOUT_SECONDS),
+        )
+        if response.status >= 400:
             try:
-                err_json = e.response.json()
-                detail = (
-                    err_json.get("error", {}).get("message")
-                    or err_json.get("message")
-                    or e.response.text
-                )
-            except Exception:
-                detail = e.response.text
-        logger.error("Error in chat endpoint HTTP request: %s", detail)
-        return JSONResponse(status_code=status_code, content={"detail": detail})
-    except requests.exceptions.RequestException as e:
+                return _groq_error_response(response.status, await response.text())
+            finally:
+                response.release()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error("Error in chat endpoint HTTP request: %s", e)
         return JSONResponse(status_code=502, content={"detail": "AI provider unreachable"})
-    except Exception as e:
+    except Exception:
         logger.exception("Error in chat endpoint")
         return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
+    async def event_generator():
+        try:
+            async for content in _iter_groq_deltas(response):
+                yield f"data: {json.dumps({'type': 'content', 'content': content})}\n\n"
+            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("Error in chat stream from AI provider: %s", e)
+            yield f"data: {json.dumps({'type': 'error', 'message': 'AI provider stream interrupted'})}\n\n"
+        finally:
+            response.release()
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no"
+    }
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=headers)
+
 
 # Admin endpoints for rate limiting
 @app.post(